@@ -7,9 +7,9 @@ This is a Python package for running memory experiments.
 __author__ = "Tyler M. Ensor (tyler.ensor@mun.ca)"
 __version__ = "0.1.0"
 
-import experiment
-import text
-import generic
-import writing
-import tetromino
-import score
+from . import experiment
+from . import text
+from . import generic
+from . import writing
+from . import tetromino
+from . import score
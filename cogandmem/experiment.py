@@ -14,9 +14,15 @@ The following functions are included. Again, see the docstrings for more
 information.
     get_position: find a position on the screen given a string; primarily used
 internally.
+    wait_for_event: get the next event, or nothing if a deadline passes first;
+primarily used internally for timed presentations.
     copy_stimuli: create a copy of a list of Stimulus objects. The copy can be
 modified without affecting the source.
     copy_word_pairs: same as copy_stimuli, but for WordPair objects.
+    prerender: render a list of Stimulus, WordPair, or Image objects ahead of
+time, so that the first presentation of each is not delayed by rendering.
+    load_image: load an image file, scaled to a given size; loaded images are
+cached.
     single_item_study_phase: present a study phase consisting of Stimulus
 objects as stimuli.
     free_recall_test: present a free-recall test.
@@ -29,22 +35,22 @@ Restrictions can be included so that certain pairs cannot be generated.
     cued_recall_test: test phase for cued recall.
 """
 
-from __future__ import division
-
 import sys
 import os
+import io
+import itertools
+import random
 import numpy as np
-import time
-import copy
+from collections import OrderedDict
 
 import pygame
 from pygame.locals import *
 
-import text
-import score
-import tetromino
-import writing
-import generic
+from . import text
+from . import score
+from . import tetromino
+from . import writing
+from . import generic
 
 
 BLACK = (0, 0, 0)
@@ -54,6 +60,13 @@ LETTERS = (
     K_n, K_o, K_p, K_q, K_r, K_s, K_t, K_u, K_v, K_w, K_x, K_y, K_z
 )
 NUMBERS = (K_0, K_1, K_2, K_3, K_4, K_5, K_6, K_7, K_8, K_9)
+# Default characters for rating-scale anchors (the names of the keys in
+# NUMBERS[1:] and LETTERS):
+NUMBER_ANCHORS = ("1", "2", "3", "4", "5", "6", "7", "8", "9")
+LETTER_ANCHORS = (
+    "A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K", "L", "M",
+    "N", "O", "P", "Q", "R", "S", "T", "U", "V", "W", "X", "Y", "Z"
+)
 SCREEN_POSITIONS = (
     "top left", "top centre", "top center", "top right",
     "middle left", "middle centre", "middle center", "middle right",
@@ -64,7 +77,30 @@ BOTTOM = "bottom"
 LEFT = "left"
 RIGHT = "right"
 MIDDLE = "middle"
-SENTENCE_TERMINATORS = (".", "!", "?"'')
+# A tuple rather than a set, as it is passed to str.endswith():
+SENTENCE_TERMINATORS = (".", "!", "?")
+# Horizontal and vertical alignment for each of SCREEN_POSITIONS:
+POSITION_ALIGNMENTS = {}
+for position in SCREEN_POSITIONS:
+    vertical, horizontal = position.split()
+    if horizontal == "center":
+        horizontal = "centre"
+    POSITION_ALIGNMENTS[position] = (horizontal, vertical)
+del position, vertical, horizontal
+# Loaded (and scaled) images, by file name and size, with the least recently
+# used dropped beyond IMAGE_CACHE_SIZE; see load_image:
+IMAGE_CACHE = OrderedDict()
+IMAGE_CACHE_SIZE = 32
+EXIT_KEYS = frozenset((K_ESCAPE,))   # default keys that end the program
+# Events that nothing here responds to, blocked while waiting for input (see
+# generic.block_events):
+IGNORED_EVENTS = (
+    MOUSEMOTION, MOUSEBUTTONDOWN, MOUSEBUTTONUP, MOUSEWHEEL, JOYAXISMOTION,
+    JOYBALLMOTION, JOYHATMOTION, JOYBUTTONDOWN, JOYBUTTONUP, TEXTINPUT
+)
+# Milliseconds before a deadline at which timed presentations stop sleeping on
+# the event queue and poll it instead (see wait_for_event):
+DEADLINE_SPIN = 2
 START = USEREVENT+1   # to know when time within an interval begins
 TIME_UP = USEREVENT+2 # used to track when stimulus presentation ends
 
@@ -99,32 +135,57 @@ def get_position(p, s, f, top, right, bottom, left):
     Returns:
         x and y: the x-y pixel coordinate for the centre of s.
     """
-    assert p in SCREEN_POSITIONS, "p must be a string from SCREEN_POSITIONS."
+    try:
+        horizontal, vertical = POSITION_ALIGNMENTS[p]
+    except KeyError:
+        raise ValueError("p must be a string from SCREEN_POSITIONS.")
     assert 0 <= top+bottom < 1, "The sum of top and bottom must be between 0 \
 and 1."
     assert 0 <= left+right < 1, "The sum of left and right must be between 0 \
 and 1."
     screen_width, screen_height = text.screen_dimensions()
-    left_trim = int(left*screen_width//2)
-    right_trim = int(right*screen_width//2)
-    top_trim = int(top*screen_height//2)
-    bottom_trim = int(bottom*screen_height//2)
-    stimulus_width, stimulus_height = f.size(s)
-    if "left" in p:
-        x = left_trim+stimulus_width//2
-    elif "centre" in p or "center" in p:
+    # Only the margins on the sides the stimulus is aligned to are needed.
+    if horizontal == LEFT:
+        stimulus_width = text.string_size(s, f)[0]
+        x = int(left*screen_width//2)+stimulus_width//2
+    elif horizontal == RIGHT:
+        stimulus_width = text.string_size(s, f)[0]
+        x = screen_width-int(right*screen_width//2)-stimulus_width//2
+    else:
         x = screen_width//2
-    elif "right" in p:
-        x = screen_width-right-stimulus_width//2
-    if "top" in p:
-        y = top_trim+stimulus_height//2
-    elif "middle" in p:
+    if vertical == TOP:
+        stimulus_height = text.string_size(s, f)[1]
+        y = int(top*screen_height//2)+stimulus_height//2
+    elif vertical == BOTTOM:
+        stimulus_height = text.string_size(s, f)[1]
+        y = screen_height-int(bottom*screen_height//2)-stimulus_height//2
+    else:
         y = screen_height//2
-    elif "bottom" in p:
-        y = screen_height-bottom_trim-stimulus_height//2
     return x, y
 
 
+def wait_for_event(end):
+    """
+    Return the next event, or a NOEVENT event if none arrives before end.
+    
+    The function sleeps on the event queue until DEADLINE_SPIN milliseconds
+    before end; after that, the queue is only polled, as a sleep that close to
+    the deadline might overshoot it. Calling the function in a loop until end
+    therefore ends a presentation within about a millisecond of end.
+    
+    Parameters:
+        end: the deadline, in milliseconds, on the pygame.time.get_ticks()
+            clock.
+    
+    Returns:
+        event: a pygame event; its type is NOEVENT if none was waiting.
+    """
+    time_left = end-pygame.time.get_ticks()
+    if time_left > DEADLINE_SPIN:
+        return pygame.event.wait(time_left-DEADLINE_SPIN)
+    return pygame.event.poll()
+
+
 class InterTrialStimulus:
     """
     Class for inter-trial stimuli.
@@ -155,7 +216,15 @@ class InterTrialStimulus:
         y: the y coordinate of fixation's centre; None if fixation is False in
             a Boolean context.
         surface: pygame.Surface object for displaying the InterTrialStimulus.
+            If a display mode has been set, the surface is converted to the
+            display's pixel format.
+        converted: Boolean indicating whether surface has been converted to
+            the display's pixel format.
         rect: pygame.Rect object corresponding to the surface.
+        covers_screen: Boolean indicating whether surface covers the whole
+            display.
+        fixation_rect: pygame.Rect object giving the position of fixation on
+            the display.
     
     Non-Attribute Parameters:
         top, right, bottom, left: any proportion of each part of the screen to
@@ -166,8 +235,16 @@ class InterTrialStimulus:
     
     Methods:
         present: present an interstimulus interval.
+        release: give surface back for reuse by a later InterTrialStimulus of
+            the same size; the object cannot be presented afterwards.
     """
     
+    __slots__ = (
+        "duration", "fixation", "font", "colour", "background", "antialiasing",
+        "x", "y", "location", "surface", "converted", "rect", "covers_screen",
+        "fixation_rect"
+    )
+    
     def __init__(self, duration, fixation = "+", font = None, colour = WHITE, background = BLACK, antialiasing = True, location = "middle centre", top = 0.025, right = 0.025, bottom = 0.025, left = 0.025, final_width = None, final_height = None):
         """Initialize an InterTrialStimulus object."""
         self.duration = duration
@@ -181,34 +258,39 @@ class InterTrialStimulus:
 between 0 and 1."
             assert 0 <= left+right < 1, "The sum of left and right must be \
 between 0 and 1."
-            try:
+            if isinstance(location, str):
                 location = get_position(
                     location, fixation, font, top, right, bottom, left
                 )
-                x, y = location
-            except AssertionError:
-                x, y = location
+            x, y = location
             self.x = x
             self.y = y
             self.location = location
-        fixation_surface, fixation_rect = text.render_string(
-            fixation, font, colour, background, antialiasing
-        )
+        if fixation:
+            fixation_surface, fixation_rect = text.render_string(
+                fixation, font, colour, background, antialiasing
+            )
+        else:
+            # A blank screen; there is nothing to render.
+            fixation_surface = None
+            fixation_rect = pygame.Rect(0, 0, 0, 0)
         # Surface and rect probably aren't the right size.
+        screen_width, screen_height = text.screen_dimensions()
+        if final_width is None or final_height is None:
+            final_width, final_height = screen_width, screen_height
+        # Reuse a surface released by an earlier InterTrialStimulus if one of
+        # the right size is available (see release); these have already been
+        # converted.
         try:
+            pool = text.SURFACE_POOL[(final_width, final_height)]
+            final_surface = pool.pop()
+            converted = True
+        except (KeyError, IndexError):
             final_surface = pygame.Surface((final_width, final_height))
-        except ValueError:
-            final_width, final_height = text.screen_dimensions()
-            final_surface = pygame.Surface((final_width, final_height))
+            converted = False
         final_rect = final_surface.get_rect()
         # final_rect may not be positioned correctly in relation to the
         # current display surface.
-        screen = pygame.display.get_surface()
-        try:
-            screen_width, screen_height = screen.get_size()
-        except AttributeError:
-            # Just guess:
-            screen_width, screen_height = pygame.display.list_modes()[0]
         if final_rect.width < screen_width:
             final_rect.left = (screen_width-final_rect.width)//2
         elif final_rect.width > screen_width:
@@ -219,23 +301,68 @@ between 0 and 1."
             raise ValueError("The specified screen dimensions are too big.")
         fixation_rect.center = final_rect.center
         final_surface.fill(background)
-        final_surface.blit(fixation_surface, fixation_rect)
+        if fixation_surface is not None:
+            final_surface.blit(fixation_surface, fixation_rect)
+        # Match the display's pixel format so that present only has to copy
+        # pixels:
+        if not converted:
+            try:
+                final_surface = final_surface.convert()
+                converted = True
+            except pygame.error:
+                # No display mode has been set yet.
+                pass
         self.surface = final_surface
+        self.converted = converted
         self.rect = final_rect
+        # If the surface covers the whole display, present need not clear the
+        # display first.
+        self.covers_screen = final_rect.topleft == (0, 0) and \
+final_rect.size == (screen_width, screen_height)
+        self.fixation_rect = fixation_rect.move(final_rect.topleft)
     
-    def present(self, time_change = 0, clock = None, frame_rate = 30, exit_keys = (K_ESCAPE,), files = ()):
+    def release(self):
+        """
+        Give self.surface back to text.SURFACE_POOL so that a later
+        InterTrialStimulus of the same size can reuse it instead of creating
+        and converting a new surface.
+        
+        Only call this once the InterTrialStimulus is no longer needed, and do
+        not keep any other reference to its surface: the surface will be
+        drawn over by whichever InterTrialStimulus reuses it. Afterwards,
+        self.surface is None, and the object cannot be presented. Surfaces
+        that were never converted to the display's pixel format are not
+        pooled. The pool is emptied by text.clear_render_cache (and so by
+        text.init_display).
+        """
+        if self.converted and self.surface is not None:
+            pool = text.SURFACE_POOL.setdefault(self.surface.get_size(), [])
+            if len(pool) < text.SURFACE_POOL_SIZE:
+                pool.append(self.surface)
+        self.surface = None
+        self.converted = False
+    
+    def present(self, time_change = 0, clock = None, frame_rate = 30, exit_keys = EXIT_KEYS, files = (), update_rects = None):
         """
         Present the InterTrialStimulus for self.duration milliseconds.
         
         Keyword Parameters:
             time_change: milliseconds to add or subtract from self.duration;
                 defaults to 0. The duration attribute is left unchanged.
-            clock: pygame.time.Clock object; defaults to None, in which case
-                one is created.
-        frame_rate: frames per second; defaults to 30.
+            clock: no longer used, because the method now sleeps on the
+                event queue until an event arrives or time runs out; still
+                accepted so that existing calls work.
+            frame_rate: likewise no longer used; still accepted so that
+                existing calls work.
             exit_keys: keys that exit the program; defaults to escape.
             files: any files to close if the program exits; defaults to an
                     empty tuple.
+            update_rects: a list of pygame.Rect objects covering everything
+                drawn on the display since it was last cleared to the
+                background (e.g., the rect of the preceding stimulus);
+                defaults to None, in which case the whole display is updated.
+                If update_rects is passed, only these rects and fixation_rect
+                are updated.
         """
         try:
             set_timer_for = self.duration+time_change
@@ -245,27 +372,30 @@ between 0 and 1."
         if set_timer_for <= 0:
             return
         else:
+            exit_keys = frozenset(exit_keys)
             main_surface = pygame.display.get_surface()
-            main_surface.fill(self.background)
+            if not self.converted:
+                # The display did not exist when the surface was built.
+                self.surface = self.surface.convert()
+                self.converted = True
+            if not self.covers_screen:
+                main_surface.fill(self.background)
             main_surface.blit(self.surface, self.rect)
-            if isinstance(set_timer_for, float):
-                set_timer_for = int(round(set_timer_for))
-            pygame.time.set_timer(TIME_UP, set_timer_for)
-            pygame.display.update()
-            while True:
-                for event in pygame.event.get():
-                    if event.type == QUIT or (event.type == KEYUP and event.key in exit_keys):
-                        generic.terminate(files)
-                    elif event.type == TIME_UP:
-                        pygame.time.set_timer(TIME_UP, 0)
-                        return
-                    else:
-                        pass
-                try:
-                    clock.tick(frame_rate)
-                except AttributeError:
-                    clock = pygame.time.Clock()
-                    clock.tick(frame_rate)
+            # pygame ticks are integer milliseconds:
+            set_timer_for = int(round(set_timer_for))
+            if update_rects:
+                pygame.display.update(list(update_rects)+[self.fixation_rect])
+            else:
+                pygame.display.update()
+            # Sleep on the event queue until the time is up; only a quit can
+            # interrupt the interval.
+            end = pygame.time.get_ticks()+set_timer_for
+            time_left = set_timer_for
+            while time_left > 0:
+                event = wait_for_event(end)
+                if event.type == QUIT or (event.type == KEYUP and event.key in exit_keys):
+                    generic.terminate(files)
+                time_left = end-pygame.time.get_ticks()
         return
 
 
@@ -274,7 +404,8 @@ class RatingScale:
     Class for rating scales.
     
     NB: Currently, the Scale class only supports scales that respond to
-        keypresses (i.e., mouse-click scales are not supported).
+        keypresses (i.e., mouse-click scales are not supported). Because the
+        mouse is not used, creating a RatingScale blocks MOUSEMOTION events.
     
     Attributes:
         choices: the number of points or categories one can select on the
@@ -316,12 +447,27 @@ class RatingScale:
     
         Other Attributes:
             surface: the rating scale's pygame.Surface object.
+            converted: Boolean indicating whether surface has been converted
+                to the display's pixel format.
         rect: the pygame.Rect object corresponding to surface.
+        key_characters: dict mapping each of keys to its character.
+        positions: dict mapping the placement arguments of get_rating (and the
+            screen size) to the top-left corner computed for rect.
+        frame: pygame.Surface object holding the last complete screen drawn
+            by get_rating without rated_text; None until then.
+        frame_key: the placement arguments (see positions) used to draw frame.
     
     Methods:
         get_rating: present rating scale and get response.
     """
     
+    __slots__ = (
+        "choices", "font", "horizontal", "colour", "background",
+        "antialiasing", "numbers", "characters", "keys", "key_characters",
+        "size", "surface", "converted", "rect", "positions", "frame",
+        "frame_key"
+    )
+    
     def __init__(self, choices, font, horizontal = True, colour = WHITE, background = BLACK, antialiasing = True, size = 0.5, numbers = True, characters = None, keys = None):
         """Initialize a RatingScale object."""
         if numbers and not keys:
@@ -346,55 +492,37 @@ keys must be equal to the number of choices."
         if size <= 1:
             # size is a proportion, so determine the specific number of pixel
             # columns/rows:
-            screen = pygame.display.get_surface()
+            screen_width, screen_height = text.screen_dimensions()
             if horizontal:
-                try:
-                    pixels = screen.get_size()[0]
-                except AttributeError:
-                    # Just take the first supported screen width:
-                    pixels = pygame.display.list_modes()[0][0]
+                pixels = screen_width
             else:
-                try:
-                    pixels = screen.get_size()[1]
-                except AttributeError:
-                    pixels = pygame.display.list_modes()[0][1]
+                pixels = screen_height
             size = int(size*pixels)
         if not characters:
-            characters = []
             if numbers:
-                current_key = K_1
+                characters = list(NUMBER_ANCHORS[:choices])
             else:
-                current_key = K_a
-            for i in xrange(choices):
-                character = pygame.key.name(current_key)
-                if not numbers:
-                    character = character.upper()
-                characters.append(character)
-                current_key = current_key+1
+                characters = list(LETTER_ANCHORS[:choices])
         self.characters = characters
         if not keys:
-            keys = []
             if numbers:
-                current_key = K_1
+                keys = list(NUMBERS[1:choices+1])
             else:
-                current_key = K_a
-            for i in xrange(choices):
-                keys.append(current_key)
-                current_key = current_key+1
+                keys = list(LETTERS[:choices])
         self.keys = keys
+        self.key_characters = dict(zip(keys, characters))
         pixels_per_anchor = size//len(characters)
         # Update size:
         size = pixels_per_anchor*len(characters)
         self.size = size
+        # Measure each anchor once:
+        sizes = [text.string_size(character, font) for character in characters]
         if horizontal:
-            assert all(font.size(character)[0] < pixels_per_anchor for \
-character in characters), "At least one of the anchor characters is too wide \
-when rendered with the given font."
+            assert all(width < pixels_per_anchor for width, height in sizes), \
+"At least one of the anchor characters is too wide when rendered with the \
+given font."
             # Build the surface and rect attributes:
-            height = font.size(characters[0])[1]
-            for character in characters[1:]:
-                if font.size(character)[1] > height:
-                    height = font.size(character)[1]
+            height = max(height for width, height in sizes)
             scale_surface = pygame.Surface((size, height))
             scale_surface.fill(background)
             left_margin = 0
@@ -406,13 +534,10 @@ when rendered with the given font."
                 left_margin = left_margin+pixels_per_anchor
                 scale_surface.blit(character_surf, character_rect)
         else:
-            assert all(font.size(character)[1] < pixels_per_anchor for \
-character in characters), "At least one of the anchor characters is too tall \
-when rendered with the given font."
-            width = font.size(characters[0])[0]
-            for character in characters[1:]:
-                if font.size(character)[0] > width:
-                    width = font.size(character)[0]
+            assert all(height < pixels_per_anchor for width, height in sizes), \
+"At least one of the anchor characters is too tall when rendered with the \
+given font."
+            width = max(width for width, height in sizes)
             scale_surface = pygame.Surface((width, size))
             scale_surface.fill(background)
             top_margin = 0
@@ -424,9 +549,15 @@ when rendered with the given font."
                 top_margin = top_margin+pixels_per_anchor
                 scale_surface.blit(character_surf, character_rect)
         self.surface = scale_surface
+        # surface is converted to the display's pixel format the first time
+        # get_rating is called.
+        self.converted = False
         self.rect = scale_surface.get_rect()
+        self.positions = {}
+        self.frame = None
+        self.frame_key = None
     
-    def get_rating(self, scale_position = BOTTOM, rated_text = None, duration = None, return_after_input = False, text_position = MIDDLE, exclude_top = 0.025, exclude_right = 0.025, exclude_bottom = 0.025, exclude_left = 0.025, text_colour = None, text_background = None, text_font = None, text_antialias = True, timer = None, frame_rate = 30, exit_keys = (K_ESCAPE,), files = ()):
+    def get_rating(self, scale_position = BOTTOM, rated_text = None, duration = None, return_after_input = False, text_position = MIDDLE, exclude_top = 0.025, exclude_right = 0.025, exclude_bottom = 0.025, exclude_left = 0.025, text_colour = None, text_background = None, text_font = None, text_antialias = True, timer = None, frame_rate = 30, exit_keys = EXIT_KEYS, files = ()):
         """
         Get input on the rating scale.
         
@@ -472,16 +603,17 @@ when rendered with the given font."
         
         Returns:
             rating: the rating made to the scale.
-            time_remaining: None unless duration and return_after_input both
-                evaluate to True in a Boolean context, in which case the
-                number of milliseconds remaining is returned.
+            time_remaining: only returned if duration and return_after_input
+                both evaluate to True in a Boolean context; this is the
+                number of milliseconds (an int, not seconds) that remained of
+                duration when the response was made, or 0 if no response was
+                made in time. It can be passed directly to
+                InterTrialStimulus.present as time_change.
         """
-        screen = pygame.display.get_surface()
-        try:
-            screen.fill(self.background)
-        except AttributeError:
-            screen = pygame.display.set_mode(pygame.display.list_modes()[0])
-            screen.fill(self.background)
+        screen = text.get_screen()
+        if not self.converted:
+            self.surface = self.surface.convert()
+            self.converted = True
         # Get permitted dimensions:
         screen_width, screen_height = screen.get_size()
         pixel_columns = int(screen_width-(exclude_left+exclude_right)*screen_width)
@@ -489,7 +621,20 @@ when rendered with the given font."
         # Position scale:
         scale_surface = self.surface
         scale_rect = self.rect
-        if self.horizontal:
+        position_key = (
+            scale_position, exclude_top, exclude_right, exclude_bottom,
+            exclude_left, screen_width, screen_height
+        )
+        # Without rated_text, the frame only depends on position_key, so a
+        # previously composed frame can be reused:
+        reuse_frame = not rated_text and position_key == self.frame_key
+        if reuse_frame:
+            screen.blit(self.frame, (0, 0))
+        else:
+            screen.fill(self.background)
+        if position_key in self.positions:
+            scale_rect.topleft = self.positions[position_key]
+        elif self.horizontal:
             scale_rect.left = int(exclude_left*screen_width+pixel_columns//2-scale_rect.width//2)+1
             if scale_position == TOP:
                 scale_rect.top = int(exclude_top*screen_height+1)
@@ -513,6 +658,7 @@ when rendered with the given font."
                 )
             else:
                 scale_rect.right = int(screen_width-exclude_right*screen_width-1)
+        self.positions[position_key] = scale_rect.topleft
         if rated_text:
             try:
                 # rated_text might be a Stimulus object.
@@ -541,21 +687,21 @@ when rendered with the given font."
                         if scale_position == TOP or scale_position == BOTTOM:
                             max_width = pixel_columns
                             if scale_position == TOP:
-                                max_height = pixel_rows-scale_rect.height-self.font.get_linesize()
+                                max_height = pixel_rows-scale_rect.height-text.line_size(self.font)
                             else:
-                                max_height = pixel_rows-scale_rect.height-text_font.get_linesize()
+                                max_height = pixel_rows-scale_rect.height-text.line_size(text_font)
                         elif scale_position == LEFT or scale_position == RIGHT:
                             max_height = pixel_rows
-                            max_width = pixel_columns-scale_rect.width-self.font.size(" ")[0]
+                            max_width = pixel_columns-scale_rect.width-text.string_size(" ", self.font)[0]
                         elif self.horizontal:
                             max_width = pixel_columns
                             if text_position == TOP:
-                                max_height = pixel_rows//2-scale_rect.height//2-text_font.get_linesize()
+                                max_height = pixel_rows//2-scale_rect.height//2-text.line_size(text_font)
                             else:
-                                max_height = pixel_rows//2-scale_rect.height//2-self.font.get_linesize()
+                                max_height = pixel_rows//2-scale_rect.height//2-text.line_size(self.font)
                         else:
                             max_height = pixel_rows
-                            max_width = pixel_columns//2-scale_rect.width//2-self.font.size(" ")[0]
+                            max_width = pixel_columns//2-scale_rect.width//2-text.string_size(" ", self.font)[0]
                         rated_surf, rated_rect = memory.text.string_to_surface_and_rect(
                             rated_text, text_font, text_colour,
                             text_background, max_width, max_height,
@@ -592,40 +738,56 @@ when rendered with the given font."
                 else:
                     scale_rect.right = scale_rect.left-(pixel_columns-scale_rect.width)//2+rated_rect.width//2
             screen.blit(rated_surf, rated_rect)
-        screen.blit(scale_surface, scale_rect)
+        if not reuse_frame:
+            screen.blit(scale_surface, scale_rect)
+            if not rated_text:
+                self.frame = screen.copy()
+                self.frame_key = position_key
         pygame.display.update()
+        # Work in integer SDL ticks so that the deadline and response times
+        # share the clock used to timestamp events.
         if duration:
-            duration_as_seconds = generic.milliseconds_to_seconds(duration)
-            start_time = time.time()
-            if not return_after_input:
-                response_obtained = False
-        while True:
-            if duration and time.time()-start_time >= duration_as_seconds:
-                if return_after_input:
-                    return None, 0
-                else:
-                    try:
+            deadline = pygame.time.get_ticks()+int(round(duration))
+        else:
+            deadline = None
+        rating = None
+        if timer is None:
+            timer = pygame.time.Clock()
+        exit_keys = frozenset(exit_keys)
+        # Only KEYUP events are used, so mouse, joystick, and text-input
+        # events are kept out of the event queue while waiting for a rating:
+        blocked = generic.block_events(IGNORED_EVENTS)
+        try:
+            while True:
+                if deadline is not None and pygame.time.get_ticks() >= deadline:
+                    if return_after_input:
+                        return None, 0
+                    else:
                         return rating
-                    except NameError:
-                        return
-            for event in pygame.event.get():
-                if event.type == QUIT or (event.type == KEYUP and event.key in exit_keys):
-                    generic.terminate(files)
-                elif event.type == KEYUP and event.key in self.keys:
-                    if duration and return_after_input:
-                        return self.characters[self.keys.index(event.key)], time.time()-start_time
-                    elif duration and not return_after_input:
-                        rating = self.characters[self.keys.index(event.key)]
-                        response_obtained = True
+                # Every event is fetched (and those other than QUIT and KEYUP
+                # are dropped), so that nothing unread, such as KEYDOWN, is
+                # left on the queue for later code:
+                for event in pygame.event.get():
+                    if event.type == QUIT or (event.type == KEYUP and event.key in exit_keys):
+                        generic.terminate(files)
+                    elif event.type == KEYUP and event.key in self.key_characters:
+                        if duration and return_after_input:
+                            try:
+                                response_ticks = event.timestamp
+                            except AttributeError:
+                                # Older versions of pygame do not timestamp
+                                # events.
+                                response_ticks = pygame.time.get_ticks()
+                            return self.key_characters[event.key], max(deadline-response_ticks, 0)
+                        elif duration and not return_after_input:
+                            rating = self.key_characters[event.key]
+                        else:
+                            return self.key_characters[event.key]
                     else:
-                        return self.characters[self.keys.index(event.key)]
-                else:
-                    pass
-            try:
-                timer.tick(frame_rate)
-            except AttributeError:
-                timer = pygame.time.Clock()
+                        pass
                 timer.tick(frame_rate)
+        finally:
+            pygame.event.set_allowed(blocked)
         return
 
 
@@ -667,6 +829,11 @@ defaults to "middle centre".
         create_copy: return a copy of Stimulus.
     """
     
+    __slots__ = (
+        "word", "font", "colour", "background", "antialiasing", "condition",
+        "response", "x", "y"
+    )
+    
     def __init__(self, word, font, colour = WHITE, background = BLACK, antialiasing = True, condition = None, x = None, y = None, response = None, position = "middle centre", top_exclude = 0.025, right_exclude = 0.025, bottom_exclude = 0.025, left_exclude = 0.025):
         """Initialize a Stimulus object."""
         self.word = word
@@ -690,8 +857,15 @@ defaults to "middle centre".
         self.y = y
     
     def get_surface(self):
-        """Return the pygame.Surface for the Stimulus."""
-        return self.font.render(self.word, self.antialiasing, self.colour)
+        """
+        Return the pygame.Surface for the Stimulus.
+        
+        The surface comes from text.render_string's cache, so it may be shared
+        with other objects; blit from it, but do not draw on it.
+        """
+        return text.render_string(
+            self.word, self.font, self.colour, None, self.antialiasing
+        )[0]
     
     def get_surface_and_rect(self):
         """Get the Surface and Rect objects with Rect centred at (x, y)."""
@@ -700,7 +874,7 @@ defaults to "middle centre".
         r.center = (self.x, self.y)
         return s, r
     
-    def study(self, duration, ticker = None, frame_rate = 30, quit_keys = (K_ESCAPE,), files = ()):
+    def study(self, duration, ticker = None, frame_rate = 30, quit_keys = (K_ESCAPE,), files = (), update_rects = None):
         """
         Present the stimulus for duration milliseconds.
         
@@ -708,38 +882,47 @@ defaults to "middle centre".
             duration: milliseconds for which to present stimulus.
         
         Keyword Parameters:
-            ticker: pygame.time.Clock object; defaults to None. If one is not
-                passed, one is created.
-            frame_rate: frames per second; defaults to 30.
+            ticker: no longer used, because the method now sleeps on the
+                event queue rather than polling it every frame; still
+                accepted so that existing calls work.
+            frame_rate: likewise no longer used; still accepted so that
+                existing calls work.
             quit_keys: keys that exit the program; defaults to the escape key.
             files: any files that need to be closed if the program exits;
                 defaults to an empty tuple.
+            update_rects: a list of pygame.Rect objects covering everything
+                drawn on the display since it was last cleared to the
+                background (e.g., the rect returned by the previous call to
+                study); defaults to None, in which case the whole display is
+                cleared and updated. If update_rects is passed, only these
+                rects and the stimulus' rect are cleared and updated.
+        
+        Returns:
+            r: the pygame.Rect object in which the stimulus was drawn.
         """
         s, r = self.get_surface_and_rect()
-        trial_over = False
-        screen = pygame.display.get_surface()
-        try:
-            screen.fill(self.background)
-        except AttributeError:
-            screen = pygame.display.set_mode(pygame.display.list_modes()[0])
+        screen = text.get_screen()
+        if update_rects:
+            update_rects = list(update_rects)+[r]
+            for update_rect in update_rects:
+                screen.fill(self.background, update_rect)
+        else:
             screen.fill(self.background)
         screen.blit(s, r)
-        pygame.time.set_timer(TIME_UP, duration)
-        pygame.display.update()
-        while not trial_over:
-            for event in pygame.event.get():
-                if event.type == QUIT or (event.type == KEYUP and event.key in quit_keys):
-                    generic.terminate(files)
-                elif event.type == TIME_UP:
-                    trial_over = True
-                    pygame.time.set_timer(TIME_UP, 0)
-                else:
-                    pass
-            try:
-                ticker.tick(frame_rate)
-            except AttributeError:
-                ticker = pygame.time.Clock()
-                ticker.tick(frame_rate)
+        if update_rects:
+            pygame.display.update(update_rects)
+        else:
+            pygame.display.update()
+        # Sleep on the event queue until the stimulus' time is up; only a
+        # quit can interrupt the presentation.
+        end = pygame.time.get_ticks()+duration
+        time_left = duration
+        while time_left > 0:
+            event = wait_for_event(end)
+            if event.type == QUIT or (event.type == KEYUP and event.key in quit_keys):
+                generic.terminate(files)
+            time_left = end-pygame.time.get_ticks()
+        return r
     
     def test(self, allowed_keys = LETTERS, require_return = True, allow_changes = True, show_input = True, min_input = 1, max_input = None, ticker = None, frame_rate = 30, quit_keys = (K_ESCAPE,), files = ()):
         """
@@ -758,13 +941,13 @@ defaults to "middle centre".
                 defaults to the letters a to z.
             require_return: Boolean indicating whether pressing return is
                 required upon completing input; defaults to True, and will
-                only have an effect when set to False if min_response and
-                max_response are equal (i.e., if min_response and max_response
+                only have an effect when set to False if min_input and
+                max_input are equal (i.e., if min_input and max_input
                 are unequal, then it is impossible to know when the response
                 is finished without a return keypress).
             allow_changes: Boolean indicating whether characters can be
                 deleted after being input; defaults to True; changes obviously
-                cannot be made if min_response and max_response are 1 and
+                cannot be made if min_input and max_input are 1 and
                 require_return is False.
             show_input: Boolean indicating whether typed keys from
                 allowed_keys appear on the screen. show_input is effectively
@@ -774,26 +957,25 @@ defaults to "middle centre".
             min_input: the minimum length of the response; defaults to 1.
             max_input: the maximum length of the response; defaults to None,
                 in which case no maximum is placed.
-            ticker: pygame.time.Clock object; if one is not passed, one is
-                created.
-            frame_rate: frames per second; defaults to 30.
+            ticker: no longer used, because the method now sleeps on the
+                event queue rather than polling it every frame; still
+                accepted so that existing calls work.
+            frame_rate: the number of times per second the event queue is
+                checked if no events arrive; defaults to 30.
             quit_keys: keys that exit the program; defaults to the escape key.
             files: files to close if a key from quit_keys is pressed.
         """
-        if max_response == 1 and min_response == 1 and not require_return and allow_changes:
+        if max_input == 1 and min_input == 1 and not require_return and allow_changes:
             allow_changes = False
         if allow_changes and not show_input:
             show_input = True
         
-        user_response = ""
+        # The typed characters, joined once the response is finished:
+        user_response = []
         response_obtained = False
         probe_surf = self.get_surface()
-        screen = pygame.display.get_surface()
-        try:
-            screen.fill(self.background)
-        except AttributeError:
-            screen = pygame.display.set_mode(pygame.display.list_modes[0])
-            screen.fill(self.background)
+        screen = text.get_screen()
+        screen.fill(self.background)
         screen_width, screen_height = screen.get_size()
         screen_centre = (screen_width//2, screen_height//2)
         probe_rect = probe_surf.get_rect()
@@ -801,51 +983,53 @@ defaults to "middle centre".
         screen.blit(probe_surf, probe_rect)
         
         if show_input:
-            line_size = self.font.get_linesize()
+            line_size = text.line_size(self.font)
             response_top_left = (probe_rect.left, probe_rect.bottom+line_size)
+            # Each typed character is drawn on its own to the right of the
+            # previous one, so only its rect needs to be updated:
+            glyph_rects = []
+            glyph_left = response_top_left[0]
         pygame.display.update()
+        # Look up the name of each allowed key once; the dict also serves for
+        # the membership test below.
+        key_names = {key: pygame.key.name(key) for key in allowed_keys}
+        wait_time = 1000//frame_rate
         while not response_obtained:
-            for event in pygame.event.get():
-                if event.type == QUIT or (event.type == KEYUP and event.key in quit_keys):
-                    generic.terminate(files)
-                elif event.type == KEYUP and event.key in allowed_keys and (max_input != None or len(user_response) < max_input):
-                    # This is an allowed keypress.
-                    user_response = user_response+pygame.key.name(event.key)
-                    if show_input:
-                        r_surface, r_rect = text.render_string(
-                            user_response, self.font, self.colour,
-                            self.background, antialiasing = self.antialiasing
-                        )
-                        r_rect.topleft = response_top_left
-                        screen_surface.fill(self.background, r_rect)
-                        screen.blit(r_surface, r_rect)
-                        pygame.display.update(r_rect)
-                    if not require_return and len(user_response) == max_input:
-                        # The response is finished.
-                        response_obtained = True
-                elif event.type == KEYUP and event.key == K_BACKSPACE and allow_changes and len(user_response) > 0:
-                    # The last character has been deleted.
-                    user_response = user_response[:len(r)-1]
-                    update_rect = r_rect
-                    r_surface, r_rect = text.render_string(
-                        user_response, self.font, self.colour,
+            event = pygame.event.wait(wait_time)
+            if event.type == QUIT or (event.type == KEYUP and event.key in quit_keys):
+                generic.terminate(files)
+            elif event.type == KEYUP and event.key in key_names and (max_input is None or len(user_response) < max_input):
+                # This is an allowed keypress.
+                character = key_names[event.key]
+                user_response.append(character)
+                if show_input:
+                    glyph_surface, glyph_rect = text.render_string(
+                        character, self.font, self.colour,
                         self.background, antialiasing = self.antialiasing
                     )
-                    r_rect.topleft = response_top_left
-                    screen.fill(self.background, update_rect)
-                    screen.blit(r_surface, r_rect)
-                    pygame.display.update(r_rect)
-                elif event.type == KEYUP and event.key == K_RETURN and require_return and len(user_response) >= min_input:
-                    # The subject has finished the response.
+                    glyph_rect.topleft = (
+                        glyph_left, response_top_left[1]
+                    )
+                    screen.blit(glyph_surface, glyph_rect)
+                    pygame.display.update(glyph_rect)
+                    glyph_rects.append(glyph_rect)
+                    glyph_left = glyph_rect.right
+                if not require_return and len(user_response) == max_input:
+                    # The response is finished.
                     response_obtained = True
-                else:
-                    pass
-            try:
-                ticker.tick(frame_rate)
-            except AttributeError:
-                ticker = pygame.time.Clock()
-                ticker.tick(frame_rate)
-        self.response = user_response
+            elif event.type == KEYUP and event.key == K_BACKSPACE and allow_changes and len(user_response) > 0:
+                # The last character has been deleted.
+                del user_response[-1]
+                glyph_rect = glyph_rects.pop()
+                screen.fill(self.background, glyph_rect)
+                pygame.display.update(glyph_rect)
+                glyph_left = glyph_rect.left
+            elif event.type == KEYUP and event.key == K_RETURN and require_return and len(user_response) >= min_input:
+                # The subject has finished the response.
+                response_obtained = True
+            else:
+                pass
+        self.response = "".join(user_response)
     
     def create_copy(self):
         """
@@ -853,17 +1037,17 @@ defaults to "middle centre".
         
         The returned copy can be tampered with without affecting the original:
         This is because mutable objects (like lists and dicts) are copied to
-        the new Stimulus using the copy.deepcopy() function.
+        the new Stimulus using generic.copy_if_mutable().
         """
         word_copy = self.word
         font_copy = self.font
-        colour_copy = copy.deepcopy(self.colour)
-        background_copy = copy.deepcopy(self.background)
+        colour_copy = generic.copy_if_mutable(self.colour)
+        background_copy = generic.copy_if_mutable(self.background)
         antialiasing_copy = self.antialiasing
-        condition_copy = copy.deepcopy(self.condition)
+        condition_copy = generic.copy_if_mutable(self.condition)
         x_copy = self.x
         y_copy = self.y
-        response_copy = copy.deepcopy(self.response)
+        response_copy = generic.copy_if_mutable(self.response)
         stimulus_copy = Stimulus(
             word_copy, font_copy, colour = colour_copy,
             background = background_copy, antialiasing = antialiasing_copy,
@@ -910,17 +1094,38 @@ class WordPair:
             as an orienting task); may not be applicable, and defaults to
             None.
     
+    Other Attributes:
+        word1_rect: the position of word1 within the pair surface.
+        word2_rect: the position of word2 within the pair surface.
+        pair_rect: the position of the pair surface on the screen.
+        layout_key: the attribute values and screen size word1_rect,
+            word2_rect, and pair_rect were computed with.
+        pair_surface: the last surface built by get_pair_surface_and_rect;
+            None until then.
+        pair_key: the attribute values and screen size pair_surface was
+            built with.
+    
     Methods:
         get_surface1: get the pygame.Surface for word1.
         get_surface2: get the pygame.Surface for word2.
         get_cue_surface: get the pygame.Surface object for cue.
         get_target_surface: get the pygame.Surface object for target.
         get_pair_surface: get the pygame.Surface object for WordPair.
+        get_pair_surface_and_rect: get the pygame.Surface object for WordPair
+            and the pygame.Rect object positioning it on the screen.
+        set_layout: compute where word1 and word2 are drawn.
         study: present WordPair for study.
         test: get the WordPair for test.
         create_copy: create an independently modifiable copy of WordPair.
     """
     
+    __slots__ = (
+        "word1", "word2", "font", "left_to_right", "colour", "background",
+        "antialiasing", "condition", "response", "rating", "apart", "cue",
+        "target", "word1_rect", "word2_rect", "pair_rect", "layout_key",
+        "pair_surface", "pair_key"
+    )
+    
     def __init__(self, word1, word2, font, apart = 135, left_to_right = True, cue = None, target = None, colour = WHITE, background = BLACK, antialiasing = True, condition = None, response = None, rating = None):
         """Initialize a WordPair object."""
         self.word1 = word1
@@ -937,31 +1142,38 @@ class WordPair:
             self.apart = apart
         else:
             # apart is specifying a proportion of the screen.
-            main_surface = pygame.display.get_surface()
-            try:
-                width, height = main_surface.get_size()
-            except AttributeError:
-                width, height = pygame.display.list_modes()[0]
+            width, height = text.screen_dimensions()
             if left_to_right:
                 self.apart = int(apart*width)
             else:
                 self.apart = int(apart*height)
         if not cue:
-            cue, target = np.random.choice((word1, word2), 2, False)
+            if random.random() < 0.5:
+                cue, target = word1, word2
+            else:
+                cue, target = word2, word1
         self.cue = cue
         self.target = target
+        self.set_layout()
+        self.pair_surface = None
+        self.pair_key = None
     
     def get_surface1(self):
-        """Return a surface for word1."""
-        return self.font.render(
-            self.word1, self.antialiasing, self.colour, self.background
-        )
+        """
+        Return a surface for word1. As with Stimulus.get_surface, the surface
+        is cached and should not be drawn on.
+        """
+        return text.render_string(
+            self.word1, self.font, self.colour, self.background,
+            self.antialiasing
+        )[0]
     
     def get_surface2(self):
-        """Return a surface for word2."""
-        return self.font.render(
-            self.word2, self.antialiasing, self.colour, self.background
-        )
+        """Return a surface for word2 (cached, like get_surface1)."""
+        return text.render_string(
+            self.word2, self.font, self.colour, self.background,
+            self.antialiasing
+        )[0]
     
     def get_cue_surface(self):
         """Return a surface for the cue."""
@@ -976,16 +1188,23 @@ class WordPair:
         return self.get_surface2()
     
     def get_pair_surface(self):
-        """Return a surface for the word pair."""
-        surf1 = self.get_surface1()
-        surf2 = self.get_surface2()
-        rect1 = surf1.get_rect()
-        rect2 = surf2.get_rect()
-        main_surface = pygame.display.get_surface()
-        try:
-            width, height = main_surface.get_size()
-        except AttributeError:
-            width, height = pygame.display.list_modes()[0]
+        """
+        Return a surface for the word pair. The surface is only as large as
+        needed to hold both words; see get_pair_surface_and_rect for its
+        position on the screen.
+        """
+        return self.get_pair_surface_and_rect()[0]
+    
+    def set_layout(self):
+        """
+        Compute word1_rect, word2_rect, and pair_rect from the sizes of the
+        words (no text is rendered). This is done when WordPair is
+        initialized; get_pair_surface_and_rect calls it again only if the
+        words, font, distance, orientation, or screen size have changed since.
+        """
+        width, height = text.screen_dimensions()
+        rect1 = pygame.Rect((0, 0), text.string_size(self.word1, self.font))
+        rect2 = pygame.Rect((0, 0), text.string_size(self.word2, self.font))
         if self.left_to_right:
             centre = width//2
             rect1.right = centre-self.apart//2
@@ -998,13 +1217,46 @@ class WordPair:
             rect2.top = centre+self.apart//2
             rect1.left = width//2-rect1.width//2
             rect2.left = width//2-rect2.width//2
-        s = pygame.Surface((width, height))
-        s.fill(self.background)
-        s.blit(surf1, rect1)
-        s.blit(surf2, rect2)
-        return s
+        # Only the area covered by the two words needs to be drawn:
+        pair_rect = rect1.union(rect2)
+        self.word1_rect = rect1.move(-pair_rect.left, -pair_rect.top)
+        self.word2_rect = rect2.move(-pair_rect.left, -pair_rect.top)
+        self.pair_rect = pair_rect
+        self.layout_key = (
+            self.word1, self.word2, self.font, self.apart, self.left_to_right,
+            width, height
+        )
     
-    def study(self, duration, scale = None, end_after_input = True, ticker = None, frame_rate = 30, exit_keys = (K_ESCAPE,), other_files = ()):
+    def get_pair_surface_and_rect(self):
+        """
+        Return a surface for the word pair and a rect giving its position on
+        the screen.
+        
+        The surface is built once and stored in pair_surface. It is only
+        rebuilt if an attribute affecting its appearance, or the size of the
+        screen, changes. As with the other surfaces, do not draw on it.
+        """
+        width, height = text.screen_dimensions()
+        layout_key = (
+            self.word1, self.word2, self.font, self.apart, self.left_to_right,
+            width, height
+        )
+        if layout_key != self.layout_key:
+            self.set_layout()
+        pair_key = (
+            layout_key, tuple(self.colour), tuple(self.background),
+            self.antialiasing
+        )
+        if pair_key != self.pair_key:
+            s = pygame.Surface(self.pair_rect.size)
+            s.fill(self.background)
+            s.blit(self.get_surface1(), self.word1_rect)
+            s.blit(self.get_surface2(), self.word2_rect)
+            self.pair_surface = s
+            self.pair_key = pair_key
+        return self.pair_surface, self.pair_rect.copy()
+    
+    def study(self, duration, scale = None, end_after_input = True, ticker = None, frame_rate = 30, exit_keys = (K_ESCAPE,), other_files = (), update_rects = None):
         """
         Present WordPair for duration milliseconds. Optionally, a Scale object
         can be included. If a Scale is included, the input on the Scale is
@@ -1022,12 +1274,21 @@ class WordPair:
             end_after_input: Boolean indicating whether a trial ends when
                 input to a Scale object is entered; defaults to True, and has
                 no effect unless a Scale object is passed.
-            ticker: pygame.time.Clock object; defaults to None, in which case
-                one is created.
-            frame_rate: frames per second; defaults to 30; must be > 0.
+            ticker: no longer used, because the method now sleeps on the
+                event queue rather than polling it every frame; still
+                accepted so that existing calls work.
+            frame_rate: likewise no longer used; still accepted so that
+                existing calls work.
             exit_keys: keys that cause the program to terminate.
             files: any files to close if generic.terminate() is called; defaults
                 to an empty tuple.
+            update_rects: a list of pygame.Rect objects covering everything
+                drawn on the display since it was last cleared to the
+                background (e.g., the rect of the previous word pair);
+                defaults to None, in which case the whole display is cleared
+                and updated. If update_rects is passed, only these rects, the
+                word pair's rect, and the scale's rect are cleared and
+                updated.
         """
         if scale:
             if any(key in exit_keys for key in scale.keys):
@@ -1035,47 +1296,41 @@ class WordPair:
                     "There cannot be overlap between exit_keys and \
 scale.keys."
                 )
-        screen = pygame.display.get_surface()
-        study_surface = self.get_pair_surface()
-        study_rect = study_surface.get_rect()
-        try:
-            screen.fill(self.background)
-        except AttributeError:
-            screen = pygame.display.set_mode(pygame.display.list_modes()[0])
+        screen = text.get_screen()
+        study_surface, study_rect = self.get_pair_surface_and_rect()
+        if update_rects:
+            update_rects = list(update_rects)+[study_rect]
+            if scale:
+                update_rects.append(scale.rect)
+            for update_rect in update_rects:
+                screen.fill(self.background, update_rect)
+        else:
             screen.fill(self.background)
         screen.blit(study_surface, study_rect)
         if scale:
             screen.blit(scale.surface, scale.rect)
-        pygame.display.update()
-        pygame.time.set_timer(TIME_UP, duration)
-        if scale and end_after_input:
-            start_time = time.time()
-        while True:
-            for event in pygame.event.get():
-                if event.type == QUIT or (event.type == KEYUP and event.key in exit_keys):
-                    generic.terminate(other_files)
-                elif event.type == TIME_UP:
-                    pygame.time.set_timer(TIME_UP, 0)
-                    if end_after_input:
-                        # No response was made.
-                        return 0
-                    else:
-                        return
-                elif event.type == KEYUP and scale and event.key in scale.keys:
-                    self.rating = pygame.key.name(event.key)
-                    if end_after_input:
-                        time_studying = generic.seconds_to_milliseconds(
-                            time.time()-start_time
-                        )
-                        time_left = duration-time_studying
-                        return time_left
-                else:
-                    pass
-            try:
-                ticker.tick(frame_rate)
-            except AttributeError:
-                ticker = pygame.time.Clock()
-                ticker.tick(frame_rate)
+        if update_rects:
+            pygame.display.update(update_rects)
+        else:
+            pygame.display.update()
+        # Sleep on the event queue until an event arrives or the pair's time
+        # is up:
+        end = pygame.time.get_ticks()+duration
+        time_left = duration
+        while time_left > 0:
+            event = wait_for_event(end)
+            if event.type == QUIT or (event.type == KEYUP and event.key in exit_keys):
+                generic.terminate(other_files)
+            elif event.type == KEYUP and scale and event.key in scale.keys:
+                self.rating = pygame.key.name(event.key)
+                if end_after_input:
+                    return max(end-pygame.time.get_ticks(), 0)
+            else:
+                pass
+            time_left = end-pygame.time.get_ticks()
+        if end_after_input:
+            # No response was made.
+            return 0
         return
     
     def test(self, allowed_keys = LETTERS, ticker = None, frame_rate = 30, exit_keys = (K_ESCAPE,), files = ()):
@@ -1086,67 +1341,87 @@ scale.keys."
         Keyword Parameters:
             allowed_keys: keys the can be typed in response to the cue;
                 defaults to a-z.
-            ticker: pygame.time.Clock object; defaults to None, in which case
-                one is created.
-            frame_rate: frames per second; defaults to 30.
+            ticker: no longer used, because the method now sleeps on the
+                event queue rather than polling it every frame; still
+                accepted so that existing calls work.
+            frame_rate: the number of times per second the event queue is
+                checked if no events arrive; defaults to 30.
             exit_keys: keys that cause the program to terminate; defaults to
                 the escape key.
             files: any files that need to be closed if the program closes.
         """
-        response = ""
+        response = []
         cue_surf = self.get_cue_surface()
         cue_rect = cue_surf.get_rect()
-        screen = pygame.display.get_surface()
+        screen = text.get_screen()
         screen_width, screen_height = screen.get_size()
         cue_rect.center = (screen_width//2, screen_height//2)
         screen.fill(self.background)
         screen.blit(cue_surf, cue_rect)
-        response_top = cue_rect.bottom+self.font.get_linesize()
+        response_top = cue_rect.bottom+text.line_size(self.font)
+        response_height = self.font.get_height()
         pygame.display.update()
+        # Each typed character is rendered (or taken from the render cache)
+        # once, and kept with its rect:
+        glyphs = []
+        response_width = 0
+        response_rect = pygame.Rect(
+            screen_width//2, response_top, 0, response_height
+        )
+        # The response is assembled on a strip the width of the screen and
+        # copied to the screen in a single blit, rather than clearing and
+        # then redrawing the screen itself:
+        response_strip = pygame.Surface((screen_width, response_height))
+        response_strip.fill(self.background)
+        redraw = False
+        key_names = {key: pygame.key.name(key) for key in allowed_keys}
+        wait_time = 1000//frame_rate
         while True:
-            for event in pygame.event.get():
-                if event.type == QUIT or (event.type == KEYUP and event.key in exit_keys):
-                    generic.terminate(files)
-                elif event.type == KEYUP and event.key == K_RETURN:
-                    self.response = response
-                    return
-                elif event.type == KEYUP and event.key == K_BACKSPACE and response:
-                    old_rect = response_rect.copy()
-                    response = response[:len(response)-1]
-                    screen.fill(self.background, old_rect)
-                    response_surf, response_rect = text.render_string(
-                        response, self.font, self.colour, self.background,
-                        antialiasing = self.antialiasing
-                    )
-                    response_rect.center = (screen_width//2, screen_height//2)
-                    response_rect.top = response_top
-                    screen.blit(response_surf, response_rect)
-                    pygame.display.update(
-                        generic.combine_rects((old_rect, response_rect))
-                    )
-                elif event.type == KEYUP and event.key in allowed_keys:
-                    if response:
-                        old_rect = response_rect.copy()
-                        screen.fill(self.background, old_rect)
-                    response = response+pygame.key.name(event.key)
-                    response_surf, response_rect = text.render_string(
-                        response, self.font, self.colour, self.background,
-                        antialiasing = self.antialiasing
+            event = pygame.event.wait(wait_time)
+            if event.type == QUIT or (event.type == KEYUP and event.key in exit_keys):
+                generic.terminate(files)
+            elif event.type == KEYUP and event.key == K_RETURN:
+                self.response = "".join(response)
+                return
+            elif event.type == KEYUP and event.key == K_BACKSPACE and response:
+                del response[-1]
+                glyph_surface, glyph_rect = glyphs.pop()
+                response_width = response_width-glyph_rect.width
+                redraw = True
+            elif event.type == KEYUP and event.key in key_names:
+                character = key_names[event.key]
+                response.append(character)
+                glyphs.append(
+                    text.render_string(
+                        character, self.font, self.colour,
+                        self.background, antialiasing = self.antialiasing
                     )
-                    response_rect.center = (screen_width//2, screen_height//2)
-                    response_rect.top = response_top
-                    screen.blit(response_surf, response_rect)
-                    try:
-                        pygame.display.update(
-                            generic.combine_rects((old_rect, response_rect))
-                        )
-                    except UnboundLocalError:
-                        pygame.display.update(response_rect)
-            try:
-                ticker.tick(frame_rate)
-            except AttributeError:
-                ticker = pygame.time.Clock()
-                ticker.tick(frame_rate)
+                )
+                response_width = response_width+glyphs[-1][1].width
+                redraw = True
+            if redraw:
+                # The response is centred, so every character moves when one
+                # is added or removed; blit the cached characters rather than
+                # rendering the whole response again.
+                old_rect = response_rect
+                response_rect = pygame.Rect(
+                    0, response_top, response_width, response_height
+                )
+                response_rect.centerx = screen_width//2
+                response_strip.fill(
+                    self.background, old_rect.move(0, -response_top)
+                )
+                x = response_rect.left
+                for glyph_surface, glyph_rect in glyphs:
+                    response_strip.blit(glyph_surface, (x, 0))
+                    x = x+glyph_rect.width
+                update_rect = old_rect.union(response_rect)
+                screen.blit(
+                    response_strip, update_rect,
+                    update_rect.move(0, -response_top)
+                )
+                pygame.display.update(update_rect)
+                redraw = False
     
     def create_copy(self):
         """
@@ -1154,7 +1429,7 @@ scale.keys."
         
         The returned copy can be changed without affecting the original.
         This is because mutable objects are copied to the new WordPair using
-        copy.deepcopy() function.
+        generic.copy_if_mutable().
         """
         word1_copy = self.word1
         word2_copy = self.word2
@@ -1162,11 +1437,11 @@ scale.keys."
         left_to_right_copy = self.left_to_right
         cue_copy = self.cue
         target_copy = self.target
-        colour_copy = copy.deepcopy(self.colour)
-        background_copy = copy.deepcopy(self.background)
+        colour_copy = generic.copy_if_mutable(self.colour)
+        background_copy = generic.copy_if_mutable(self.background)
         antialiasing_copy = self.antialiasing
-        condition_copy = copy.deepcopy(self.condition)
-        response_copy = copy.deepcopy(self.response)
+        condition_copy = generic.copy_if_mutable(self.condition)
+        response_copy = generic.copy_if_mutable(self.response)
         word_pair_copy = WordPair(
             word1_copy, word2_copy, font_copy,
             left_to_right = left_to_right_copy, cue = cue_copy,
@@ -1182,11 +1457,7 @@ def copy_stimuli(stimuli):
     Return a copy of a list of stimuli. The returned copy can be modified
     without affecting the original.
     """
-    new_list = []
-    for stim in stimuli:
-        stim_copy = stim.create_copy()
-        new_list.append(stim_copy)
-    return new_list
+    return [stim.create_copy() for stim in stimuli]
 
 
 def copy_word_pairs(word_pairs):
@@ -1194,11 +1465,77 @@ def copy_word_pairs(word_pairs):
     Return a copy of a list of WordPairs. The returned copy can be modified
     without affecting the original.
     """
-    new_list = []
-    for pair in word_pairs:
-        pair_copy = pair.create_copy()
-        new_list.append(pair_copy)
-    return new_list
+    return [pair.create_copy() for pair in word_pairs]
+
+
+def prerender(items):
+    """
+    Build the surfaces for a list of Stimulus, WordPair, or Image objects
+    before they are presented.
+    
+    Surfaces are cached once built (see text.render_string,
+    WordPair.get_pair_surface_and_rect, and load_image), so calling this
+    before a study or test phase moves the cost of rendering each item out of
+    its first trial, where it would delay the item's onset. Note that
+    text.render_string keeps only the text.RENDER_CACHE_SIZE most recently
+    rendered strings and load_image the IMAGE_CACHE_SIZE most recently loaded
+    images, so for longer lists the earliest items are rendered again when
+    presented.
+    
+    Parameters:
+        items: a list of Stimulus, WordPair, and/or Image objects.
+    """
+    for item in items:
+        if isinstance(item, WordPair):
+            item.get_pair_surface()
+        else:
+            item.get_surface()
+
+
+def load_image(file_name, width = None, height = None):
+    """
+    Load an image and scale it to width by height pixels.
+    
+    Decoding an image file is slow, so the most recently used images are
+    kept in IMAGE_CACHE and returned again for the same arguments. The
+    returned surface is therefore shared and should not be drawn on.
+    
+    Parameters:
+        file_name: the image file to load.
+    
+    Keyword Parameters:
+        width and height: the size, in pixels, of the returned surface; both
+            default to None, in which case the image's own width and/or
+            height is used.
+    
+    Returns:
+        image_surface: a pygame.Surface object containing the image. If a
+            display has been set, the surface is converted to its pixel
+            format.
+    """
+    key = (file_name, width, height)
+    try:
+        image_surface = IMAGE_CACHE.pop(key)
+    except KeyError:
+        image_surface = pygame.image.load(file_name)
+        image_width, image_height = image_surface.get_size()
+        if width is None:
+            width = image_width
+        if height is None:
+            height = image_height
+        if (width, height) != (image_width, image_height):
+            image_surface = pygame.transform.scale(
+                image_surface, (width, height)
+            )
+        if pygame.display.get_surface() is not None:
+            if image_surface.get_flags() & SRCALPHA:
+                image_surface = image_surface.convert_alpha()
+            else:
+                image_surface = image_surface.convert()
+        if len(IMAGE_CACHE) >= IMAGE_CACHE_SIZE:
+            IMAGE_CACHE.popitem(last = False)
+    IMAGE_CACHE[key] = image_surface
+    return image_surface
 
 
 class Image:
@@ -1241,6 +1578,11 @@ class Image:
         create_copy: return a copy of the image.
     """
     
+    __slots__ = (
+        "file_name", "label", "background", "condition", "response", "rating",
+        "width", "height", "x", "y"
+    )
+    
     def __init__(self, file_name, label = None, background = BLACK, height = None, width = None, condition = None, x = None, y = None, response = None, rating = None):
         """Initialize an Image object."""
         self.file_name = file_name
@@ -1249,16 +1591,14 @@ class Image:
         self.condition = condition
         self.response = response
         self.rating = rating
-        if 0 < width < 1 or 0 < height < 1 or x is None or y is None:
+        width_proportion = width is not None and 0 < width < 1
+        height_proportion = height is not None and 0 < height < 1
+        if width_proportion or height_proportion or x is None or y is None:
             # The active surface is needed.
-            active_surface = pygame.display.get_surface()
-            try:
-                active_width, active_height = active_surface.get_size()
-            except AttributeError:
-                active_width, active_height = pygame.display.list_modes()[0]
-            if width < 1:
+            active_width, active_height = text.screen_dimensions()
+            if width_proportion:
                 width = int(active_width*width)
-            if height < 1:
+            if height_proportion:
                 height = int(active_height*height)
             if x is None:
                 x = active_width//2
@@ -1270,14 +1610,11 @@ class Image:
         self.y = y
     
     def get_surface(self):
-        """Return a pygame.Surface object for the image."""
-        image_surface = pygame.image.load(self.file_name)
-        # image_surface may need to be scaled.
-        if self.width != image_surface.get_width or self.height != image_surface.get_height:
-            image_surface = pygame.transform.scale(
-                image_surface, (self.width, self.height)
-            )
-        return image_surface
+        """
+        Return a pygame.Surface object for the image. The surface comes from
+        load_image's cache, so it should not be drawn on.
+        """
+        return load_image(self.file_name, self.width, self.height)
     
     def get_surface_and_rect(self):
         """
@@ -1289,7 +1626,7 @@ class Image:
         image_rect.center = (self.x, self.y)
         return image_surface, image_rect
     
-    def study(self, duration, ticker = None, frame_rate = 30, quit_keys = (K_ESCAPE,), files = ()):
+    def study(self, duration, ticker = None, frame_rate = 30, quit_keys = (K_ESCAPE,), files = (), update_rects = None):
         """
         Present Image for duration milliseconds.
         
@@ -1302,41 +1639,54 @@ class Image:
             duration: milliseconds for which to present Image.
         
         Keyword Parameters:
-            ticker: pygame.time.Clock object or None (default). If the latter,
-                a clock is created.
-            frame_rate: frames per second; defaults to 30.
+            ticker: no longer used, because the method now sleeps on the
+                event queue until an event arrives or time runs out; still
+                accepted so that existing calls work.
+            frame_rate: likewise no longer used; still accepted so that
+                existing calls work.
             quit_keys: keys that close the program when pressed; defaults to
                 the escape key.
             files: any files that need to be closed if the program exits;
                 defaults to an empty tuple.
+            update_rects: a list of pygame.Rect objects covering everything
+                drawn on the display since it was last cleared to the
+                background (e.g., the rect of the previous image); defaults
+                to None, in which case the whole display is cleared and
+                updated. If update_rects is passed, only these rects and the
+                image's rect are cleared and updated.
+        
+        Returns:
+            r: the pygame.Rect object in which the image was drawn.
         """
         s, r = self.get_surface_and_rect()
-        trial_over = False
-        screen = pygame.display.get_surface()
-        try:
-            screen.fill(self.background)
-        except AttributeError:
-            screen = pygame.display.set_mode(pygame.display.list_modes()[0])
+        screen = text.get_screen()
+        if update_rects:
+            update_rects = list(update_rects)+[r]
+            for update_rect in update_rects:
+                screen.fill(self.background, update_rect)
+        else:
             screen.fill(self.background)
         screen.blit(s, r)
-        pygame.time.set_timer(TIME_UP, duration)
-        pygame.display.update()
-        while not trial_over:
-            for event in pygame.event.get():
+        if update_rects:
+            pygame.display.update(update_rects)
+        else:
+            pygame.display.update()
+        # Sleep on the event queue until the image's time is up; only a quit
+        # can interrupt the presentation.
+        blocked = generic.block_events(IGNORED_EVENTS)
+        try:
+            end = pygame.time.get_ticks()+duration
+            time_left = duration
+            while time_left > 0:
+                event = wait_for_event(end)
                 if event.type == QUIT or (event.type == KEYUP and event.key in quit_keys):
                     generic.terminate(files)
-                elif event.type == TIME_UP:
-                    trial_over = True
-                    pygame.time.set_timer(TIME_UP, 0)
-                else:
-                    pass
-            try:
-                ticker.tick(frame_rate)
-            except AttributeError:
-                ticker = pygame.time.Clock()
-                ticker.tick(frame_rate)
+                time_left = end-pygame.time.get_ticks()
+        finally:
+            pygame.event.set_allowed(blocked)
+        return r
     
-    def get_keypress(self, response_keys = (K_o, K_n), start_time = 0, end_time = None, ticker = None, frame_rate = 30, quit_keys = (K_ESCAPE,), files = ()):
+    def get_keypress(self, response_keys = (K_o, K_n), start_time = 0, end_time = None, ticker = None, frame_rate = 30, quit_keys = (K_ESCAPE,), files = (), update_rects = None):
         """
         Present Image to the screen and wait for a key from response_keys to
         be pressed. A string denoting the pressed key is returned.
@@ -1351,53 +1701,77 @@ class Image:
                 a response, the trial ends. If end_time is None, no time limit
                 is imposed, and the probe remains on the screen until the
                 subject responds.
-            ticker: pygame.time.Clock object; defaults to None, in which case
-                a clock is created.
-            frame_rate: frames per second; defaults to 30.
+            ticker: no longer used, because the method now sleeps on the
+                event queue until an event arrives or time runs out; still
+                accepted so that existing calls work.
+            frame_rate: likewise no longer used; still accepted so that
+                existing calls work.
             quit_keys: keys that close the program; defaults to escape.
             files: any files that need to be closed if the program closes.
+            update_rects: a list of pygame.Rect objects covering everything
+                drawn on the display since it was last cleared to the
+                background (e.g., the rect of the previous image); defaults
+                to None, in which case the whole display is cleared and
+                updated. If update_rects is passed, only these rects and the
+                image's rect are cleared and updated.
+        """
+        return self._keypress_and_rect(
+            response_keys, start_time, end_time, quit_keys, files,
+            update_rects
+        )[0]
+    
+    def _keypress_and_rect(self, response_keys, start_time, end_time, quit_keys, files, update_rects):
+        """
+        Do the work of get_keypress (see its docstring for the parameters),
+        returning both the name of the key pressed (None if time ran out) and
+        the pygame.Rect object in which Image was drawn.
         """
         s, r = self.get_surface_and_rect()
-        trial_over = False
-        screen = pygame.display.get_surface()
-        try:
-            screen.fill(self.background)
-        except AttributeError:
-            screen = pygame.display.set_mode(pygame.display.list_modes()[0])
+        screen = text.get_screen()
+        if update_rects:
+            update_rects = list(update_rects)+[r]
+            for update_rect in update_rects:
+                screen.fill(self.background, update_rect)
+        else:
             screen.fill(self.background)
         screen.blit(s, r)
-        if end_time is not None:
-            pygame.time.set_timer(TIME_UP, end_time)
-        if start_time == 0:
-            response_allowed = True
+        if update_rects:
+            pygame.display.update(update_rects)
         else:
-            response_allowed = False
-            pygame.time.set_timer(START, start_time)
-        pygame.display.update()
-        while not trial_over:
-            for event in pygame.event.get():
+            pygame.display.update()
+        # Times (from pygame.time.get_ticks()) at which responses are allowed
+        # and at which the trial ends:
+        onset = pygame.time.get_ticks()
+        start = onset+start_time
+        if end_time is None:
+            end = None
+        else:
+            end = onset+end_time
+        blocked = generic.block_events(IGNORED_EVENTS)
+        try:
+            while True:
+                now = pygame.time.get_ticks()
+                if end is not None and now >= end:
+                    # No response was made in time.
+                    return None, r
+                response_allowed = now >= start
+                # Sleep until an event arrives or the next of start and end.
+                if not response_allowed:
+                    event = wait_for_event(start)
+                elif end is not None:
+                    event = wait_for_event(end)
+                else:
+                    event = pygame.event.wait()
                 if event.type == QUIT or (event.type == KEYUP and event.key in quit_keys):
                     generic.terminate(files)
-                elif event.type == START:
-                    response_allowed = True
-                    pygame.time.set_timer(START, 0)
-                elif event.type == TIME_UP:
-                    trial_over = True
-                    pygame.time.set_timer(TIME_UP, 0)
-                    pressed = None
                 elif event.type == KEYUP and event.key in response_keys and response_allowed:
-                    pressed = pygame.key.name(event.key)
-                    trial_over = True
+                    return pygame.key.name(event.key), r
                 else:
                     pass
-            try:
-                ticker.tick(frame_rate)
-            except AttributeError:
-                ticker = pygame.time.Clock()
-                ticker.tick(frame_rate)
-        return pressed
+        finally:
+            pygame.event.set_allowed(blocked)
     
-    def recognition_probe(self, allowed_keys = (K_o, K_n), begin_time = 0, finish_time = None, c = None, fps = 30, exit_keys = (K_ESCAPE,), files = ()):
+    def recognition_probe(self, allowed_keys = (K_o, K_n), begin_time = 0, finish_time = None, c = None, fps = 30, exit_keys = (K_ESCAPE,), files = (), update_rects = None):
         """
         Present Image as a recognition probe. Nothing is returned; rather, the
         response is recorded in self.response. Note that this means that any
@@ -1418,21 +1792,21 @@ class Image:
                 defaults to escape.
             files: any files that need to be closed if the program closes;
                 defaults to an empty tuple.
+            update_rects: passed on to get_keypress; see its docstring.
         """
         self.response = self.get_keypress(
             response_keys = allowed_keys, start_time = begin_time,
             end_time = finish_time, ticker = c, frame_rate = fps,
-            quit_keys = exit_keys, files = files
+            quit_keys = exit_keys, files = files, update_rects = update_rects
         )
     
-    def rate(self, allowed_keys = NUMBERS, begin_time = 0, finish_time = None, c = None, fps = 30, exit_keys = (K_ESCAPE,), files = ()):
+    def rate(self, allowed_keys = NUMBERS, begin_time = 0, finish_time = None, c = None, fps = 30, exit_keys = (K_ESCAPE,), files = (), update_rects = None):
         """
         Present Image for a rating. As currently written, the function does
         not present a RatingScale object along with the Image object but,
         provided Image does not take up the entire screen, the scale could be
-        displayed by the calling script. Nothing is returned, but self.rating
-        is updated. Note that this means that any value currently in
-        self.rating will be overwritten.
+        displayed by the calling script. The rating is stored in self.rating,
+        so any value currently in self.rating will be overwritten.
         
         Keyword Parameters:
             allowed_keys: keys that can be pressed to make a rating; defaults
@@ -1449,12 +1823,16 @@ class Image:
                 defaults to escape.
             files: any files that need to be closed if the program closes;
                 defaults to an empty tuple.
+            update_rects: passed on to get_keypress; see its docstring.
+        
+        Returns:
+            r: the pygame.Rect object in which Image was drawn.
         """
-        self.rating = self.get_keypress(
-            response_keys = allowed_keys, start_time = begin_time,
-            end_time = finish_time, ticker = c, frame_rate = fps,
-            quit_keys = exit_keys, files = files
+        self.rating, r = self._keypress_and_rect(
+            allowed_keys, begin_time, finish_time, exit_keys, files,
+            update_rects
         )
+        return r
     
     def create_copy(self):
         """
@@ -1462,14 +1840,14 @@ class Image:
         
         The returned copy can be modified without affecting the original: This
         is because mutable objects (like lists and dicts) are copied to the
-        new Image using the copy.deepcopy() function.
+        new Image using generic.copy_if_mutable().
         """
         new_file_name = self.file_name
         new_label = self.label
-        new_background = copy.deepcopy(self.background)
+        new_background = generic.copy_if_mutable(self.background)
         new_height = self.height
         new_width = self.width
-        new_condition = copy.deepcopy(self.condition)
+        new_condition = generic.copy_if_mutable(self.condition)
         new_x = self.x
         new_y = self.y
         new_response = self.response
@@ -1502,7 +1880,7 @@ def single_item_study_phase(stimuli, duration, isi, isi_fixation = "+", randomiz
             the stimuli list or in the same order as contained in the stimuli
             file; defaults to False. When True, if fonts, stimulus_colours,
             background_colours, and/or locations are set, these, too, are
-            shuffled.
+            shuffled, in the same order as stimuli.
         case: "u", "l", or an empty string; only applies if stimuli are
             strings or read from a file; all are set to uppercase if case is
             "u"; all are set to lowercase if case is "l"; all are left as is
@@ -1567,69 +1945,61 @@ def single_item_study_phase(stimuli, duration, isi, isi_fixation = "+", randomiz
     assert duration > 0, "duration must be positive."
     assert fps > 0, "fps must be positive."
     
-    try:
+    if isinstance(stimuli, (str, bytes, os.PathLike)):
+        # stimuli is a file name.
         with open(stimuli) as file_object:
-            stimuli = file_object.readlines()
-            stimuli = [stimulus.strip() for stimulus in stimuli]
-    except TypeError:
-        pass
+            stimuli = [line.strip() for line in file_object]
     
     if randomize:
-        np.random.shuffle(stimuli)
-        if fonts:
-            np.random.shuffle(fonts)
-        if stimulus_colours:
-            np.random.shuffle(stimulus_colours)
-        if background_colours:
-            np.random.shuffle(background_colours)
-        if locations:
-            np.random.shuffle(locations)
-    
-    # Convert non-Stimulus objects to Stimulus objects:
-    for i in xrange(len(stimuli)):
+        # Shuffle the per-stimulus settings in the same order as stimuli, so
+        # that the ith font (etc.) stays with the ith stimulus. As before,
+        # the lists are shuffled in place.
+        order = list(range(len(stimuli)))
+        random.shuffle(order)
+        shuffled = (
+            stimuli, fonts, stimulus_colours, background_colours, locations
+        )
+        for sequence in shuffled:
+            if sequence:
+                sequence[:] = [sequence[i] for i in order]
+    
+    # Convert non-Stimulus objects to Stimulus objects, pairing each with its
+    # font, colours, and location:
+    stimulus_count = len(stimuli)
+    stim_settings = zip(
+        fonts or [font]*stimulus_count,
+        stimulus_colours or [stimulus_colour]*stimulus_count,
+        background_colours or [background_colour]*stimulus_count,
+        locations or [location]*stimulus_count
+    )
+    # Pixel positions already worked out, by location string, stimulus, and
+    # font, so repeated stimuli are not positioned again:
+    positions = {}
+    for i, settings in enumerate(stim_settings):
         current_stim = stimuli[i]
-        if not isinstance(current_stim, Stimulus):
-            if fonts:
-                current_font = fonts[i]
-            elif i == 0:
-                current_font = font
-            if stimulus_colours:
-                current_colour = stimulus_colours[i]
-            elif i == 0:
-                current_colour = stimulus_colour
-            if background_colours:
-                current_background = background_colours[i]
-            elif i == 0:
-                current_background = background_colour
-            if case == "u" and not current_stim.isupper():
-                current_stim = current_stim.upper()
-            elif case == "l" and not current_stim.islower():
-                current_stim = current_stim.lower()
-            if locations:
-                current_location = locations[i]
-                # current_location should either be a list or string.
-                try:
-                    pixel_x, pixel_y = current_location
-                except ValueError:
-                    pixel_x, pixel_y = get_position(
-                        current_location, current_stim, current_font,
-                        top_margin, right_margin, bottom_margin, left_margin
-                    )
-            elif i == 0:
-                current_location = location
-                try:
-                    pixel_x, pixel_y = current_location
-                except ValueError:
-                    pixel_x, pixel_y = get_position(
-                        current_location, current_stim, current_font,
-                        top_margin, right_margin, bottom_margin, left_margin
-                    )
-            new_stim = Stimulus(
-                current_stim, current_font, colour = current_colour,
-                background = current_background,
-                antialiasing = use_antialiasing, x = pixel_x, y = pixel_y
-            )
-            stimuli[i] = new_stim
+        if isinstance(current_stim, Stimulus):
+            continue
+        current_font, current_colour, current_background, current_location = settings
+        if case == "u" and not current_stim.isupper():
+            current_stim = current_stim.upper()
+        elif case == "l" and not current_stim.islower():
+            current_stim = current_stim.lower()
+        # current_location should either be x-y coordinates or a string.
+        if isinstance(current_location, str):
+            position_key = (current_location, current_stim, current_font)
+            if position_key not in positions:
+                positions[position_key] = get_position(
+                    current_location, current_stim, current_font,
+                    top_margin, right_margin, bottom_margin, left_margin
+                )
+            pixel_x, pixel_y = positions[position_key]
+        else:
+            pixel_x, pixel_y = current_location
+        stimuli[i] = Stimulus(
+            current_stim, current_font, colour = current_colour,
+            background = current_background,
+            antialiasing = use_antialiasing, x = pixel_x, y = pixel_y
+        )
     
     if isi and not isi_background:
         if background_colour:
@@ -1655,22 +2025,53 @@ def single_item_study_phase(stimuli, duration, isi, isi_fixation = "+", randomiz
                 isi_colour = stimuli[0].colour
         if isi_antialiasing == None:   # unlikely
             isi_antialiasing = use_antialiasing
+    if isi:
+        # The fixation is rendered once, here, and the same surface is shown
+        # after every stimulus.
+        isi_object = InterTrialStimulus(
+            isi, isi_fixation, isi_font, isi_colour, isi_background,
+            isi_antialiasing
+        )
+    
+    prerender(stimuli)
     
-    # Present the study phase:
+    # Present the study phase. The first stimulus clears the whole display;
+    # after that, only what the previous presentation drew needs to be
+    # cleared and updated, unless the background colour changes, in which
+    # case the whole display is cleared again.
+    update_rects = None
+    previous_background = None
     for stim in stimuli:
-        stim.study(
+        background = tuple(stim.background)
+        if background != previous_background:
+            update_rects = None
+        previous_background = background
+        stim_rect = stim.study(
             duration, ticker = timer, frame_rate = fps,
-            quit_keys = keys_to_quit, files = other_files
+            quit_keys = keys_to_quit, files = other_files,
+            update_rects = update_rects
         )
+        update_rects = [stim_rect]
         if isi:
-            interstimulus_interval(
-                isi, fixation = isi_fixation, font = isi_font,
-                fixation_colour = isi_colour,
-                background_colour = isi_background,
-                antialiasing = isi_antialiasing, ticker = timer,
-                frame_rate = fps, quit_keys = keys_to_quit,
-                files = other_files
+            # Partial updates only work if the ISI's background matches the
+            # stimulus'; otherwise, the ISI fills and updates the whole
+            # display, and the next stimulus has to clear it all again.
+            same_background = tuple(isi_object.background) == background
+            if not same_background:
+                update_rects = None
+            isi_object.present(
+                clock = timer, frame_rate = fps, exit_keys = keys_to_quit,
+                files = other_files, update_rects = update_rects
             )
+            if isi_object.covers_screen and same_background:
+                # Only the fixation is left on the display.
+                update_rects = [isi_object.fixation_rect]
+            else:
+                update_rects = None
+    if isi:
+        # isi_object was made here and is not used again; let a later study
+        # phase reuse its surface:
+        isi_object.release()
     
     # Write to data_file, if necessary:
     if data_file:
@@ -1712,8 +2113,11 @@ def free_recall_test(f, line_size = None, antialias = True, text_colour = WHITE,
             appears; defaults to 2000.
         show_previous_input: Boolean indicating whether previously input
             responses remain visible after being input; defaults to False.
-        ticker: pygame.time.Clock object; created if none is passed.
-        frame_rate: frames per second; defaults to 30.
+        ticker: no longer used, because the function now sleeps on the event
+            queue until an event arrives; still accepted so that existing
+            calls work.
+        frame_rate: likewise no longer used; still accepted so that existing
+            calls work.
         quit_keys: keys that exit the program; defaults to escape.
         data_file: an optional file to which to write the subject's output
             protocol. The argument passed to this parameter can be a file
@@ -1733,25 +2137,28 @@ def free_recall_test(f, line_size = None, antialias = True, text_colour = WHITE,
         NB: Any of the message variables can be disabled by passing an empty
             string for its value.
     
+    Typed input is taken on key presses rather than key releases, with key
+    repeat enabled for the duration of the test (held keys begin repeating
+    after 400 ms and then repeat every 30 ms); the previous key-repeat
+    settings are restored before returning.
+    
     Returns:
         protocol: the subject's responses in the order entered.
     """
     assert 0 <= trim_width < 1 and 0 <= trim_height < 1, "trim_width and \
 trim_height must be proportions."
-    assert not any(k in allowed_keys for k in (K_RETURN, K_BACKSPACE)), \
-"Neither return nor backspace may appear in allowed_keys."
-    assert not any(k in quit_keys for k in (K_RETURN, K_BACKSPACE)), \
-"Neither return nor backspace may appear in quit_keys."
-    assert not any(k in allowed_keys for k in quit_keys), "There may not be \
-overlap between allowed_keys and quit_keys."
-    assert frame_rate > 0, "frame_rate must be positive."
-    
-    screen = pygame.display.get_surface()
-    try:
-        screen_width, screen_height = screen.get_size()
-    except AttributeError:
-        screen = pygame.display.set_mode(pygame.display.list_modes()[0])
-        screen_width, screen_height = screen.get_size()
+    allowed_keys = frozenset(allowed_keys)
+    quit_keys = frozenset(quit_keys)
+    reserved_keys = frozenset((K_RETURN, K_BACKSPACE))
+    assert allowed_keys.isdisjoint(reserved_keys), "Neither return nor \
+backspace may appear in allowed_keys."
+    assert quit_keys.isdisjoint(reserved_keys), "Neither return nor backspace \
+may appear in quit_keys."
+    assert allowed_keys.isdisjoint(quit_keys), "There may not be overlap \
+between allowed_keys and quit_keys."
+    
+    screen = text.get_screen()
+    screen_width, screen_height = screen.get_size()
     screen.fill(background_colour)
     pixel_columns = int(screen_width-trim_width*screen_width)
     pixel_rows = int(screen_height-trim_height*screen_height)
@@ -1760,7 +2167,9 @@ overlap between allowed_keys and quit_keys."
     bottom_margin = screen_height-top_margin
     right_margin = screen_width-left_margin
     if not line_size:
-        line_size = f.get_linesize()
+        line_size = text.line_size(f)
+    # prompt_rect stays None if there is no prompt.
+    prompt_rect = None
     if prompt:
         prompt_surface, prompt_rect = text.string_to_surface_and_rect(
             prompt, f, text_colour, background_colour, pixel_columns,
@@ -1803,16 +2212,16 @@ overlap between allowed_keys and quit_keys."
     # Get the coordinate at which responses are located (depends on
     # show_previous_input):
     if show_previous_input:
-        try:
+        if prompt_rect is not None:
             response_position = (left_margin, prompt_rect.bottom+line_size)
-        except NameError:
+        else:
             response_position = (left_margin, top_margin)
     else:
-        try:
+        if prompt_rect is not None:
             response_position = (
                 pixel_columns//2+left_margin, prompt_rect.bottom+line_size
             )
-        except NameError:
+        else:
             response_position = (
                 screen_width//2+left_margin, pixel_rows//2+top_margin
             )
@@ -1822,26 +2231,46 @@ overlap between allowed_keys and quit_keys."
         # ascertain that there will be room for another. If there will not be,
         # earliest-input words are removed from view until room is made.
         # Get the room available for responses:
-        try:
+        if prompt_rect is not None:
             space_for_responses = pixel_rows-prompt_rect.height-line_size
-        except NameError:
+        else:
             space_for_responses = pixel_rows
         # Get the height of the tallest possible line:
-        max_line_height = tallest_letter(f)
-        assert max_line_size <= space_for_responses, "There isn't enough \
+        max_line_height = text.tallest_letter(f)
+        assert max_line_height <= space_for_responses, "There isn't enough \
 room for responses to appear. Try shortening the prompt message or \
 decreasing the font size."
+        # The responses currently visible, and their height (including the
+        # gaps between them), kept up to date as responses are added and
+        # dropped:
+        on_screen = []
+        responses_height = 0
     
     protocol = []
     response = ""
+    # Typed characters are rendered one at a time (text.render_string caches
+    # them) and composed into the response, rather than rendering the whole
+    # response again on every keypress:
+    glyphs = []
+    response_width = 0
+    response_height = f.get_height()
+    response_rect = pygame.Rect(response_position, (0, 0))
+    redraw = False
     if time_limit:
         pygame.time.set_timer(TIME_UP, time_limit)
     if prompt:
         screen.blit(prompt_surface, prompt_rect)
     pygame.display.update()
-    keep_testing = True
-    while keep_testing:
-        for event in pygame.event.get():
+    key_names = {key: pygame.key.name(key) for key in allowed_keys}
+    previous_repeat = pygame.key.get_repeat()
+    pygame.key.set_repeat(400, 30)
+    blocked = generic.block_events(IGNORED_EVENTS)
+    # Key repeat and the blocked events are restored however the loop ends:
+    try:
+        keep_testing = True
+        while keep_testing:
+            # Sleep on the event queue until something happens.
+            event = pygame.event.wait()
             if event.type == QUIT or (event.type == KEYUP and event.key in quit_keys):
                 generic.terminate(other_files)
             elif event.type == TIME_UP:
@@ -1849,37 +2278,34 @@ decreasing the font size."
                 screen.fill(background_colour)
                 if time_up_message and time_up_message_duration > 0:
                     screen.blit(time_up_surface, time_up_rect)
-                    pygame.time.set_timer(TIME_UP, time_up_message_duration)
-                    end_loop = False
-                    while not end_loop:
-                        for subevent in pygame.event.get():
-                            if subevent.type == QUIT or (subevent.type == KEYUP and subevent.key in quit_keys):
-                                generic.terminate(other_files)
-                            elif subevent.type == TIME_UP:
-                                pygame.time.set_timer(TIME_UP, 0)
-                                end_loop = True
-                            else:
-                                pass
-                        try:
-                            ticker.tick(frame_rate)
-                        except AttributeError:
-                            ticker = pygame.time.Clock()
-                            ticker.tick(frame_rate)
+                    pygame.display.update()
+                    # Sleep on the event queue while the message is shown; only a
+                    # quit can interrupt it.
+                    end = pygame.time.get_ticks()+time_up_message_duration
+                    time_left = time_up_message_duration
+                    while time_left > 0:
+                        subevent = pygame.event.wait(time_left)
+                        if subevent.type == QUIT or (subevent.type == KEYUP and subevent.key in quit_keys):
+                            generic.terminate(other_files)
+                        time_left = end-pygame.time.get_ticks()
                 keep_testing = False
-            elif event.type == KEYUP and event.key == K_BACKSPACE and response:
-                response = response[:len(response)-1]
-                update_rect = response_rect
-                response_surface, response_rect = text.render_string(
-                    response, f, text_colour, background_colour, antialias
-                )
+            elif event.type == KEYDOWN and event.key == K_BACKSPACE and response:
+                response = response[:-1]
+                glyph_surface, glyph_rect = glyphs.pop()
+                response_width = response_width-glyph_rect.width
                 if show_previous_input:
-                    response_rect.topleft = response_position
+                    # response grows rightward from response_position, so
+                    # only the removed glyph needs to be cleared.
+                    response_rect.size = (response_width, response_height)
+                    glyph_rect = pygame.Rect(
+                        response_rect.topright,
+                        (glyph_rect.width, response_height)
+                    )
+                    screen.fill(background_colour, glyph_rect)
+                    pygame.display.update(glyph_rect)
                 else:
-                    response_rect.center = response_position
-                screen.fill(background_colour, update_rect)
-                screen.blit(response_surface, response_rect)
-                pygame.display.update(response_rect)
-            elif event.type == KEYUP and event.key == K_RETURN and response:
+                    redraw = True
+            elif event.type == KEYDOWN and event.key == K_RETURN and response:
                 # The subject has input the response.
                 if response == finished_string:
                     original_surface = screen.copy()
@@ -1888,90 +2314,92 @@ decreasing the font size."
                     pygame.display.update()
                     finished_verifying = False
                     while not finished_verifying:
-                        for subevent in pygame.event.get():
-                            if subevent.type == QUIT or (subevent.type == KEYUP and subevent.key in quit_keys):
-                                generic.terminate(other_files)
-                            elif subevent.type == TIME_UP:
-                                finished_verifying = True
-                                pygame.time.set_timer(TIME_UP, 0)
-                                screen.fill(background_colour)
-                                if time_up_message and time_up_message_duration > 0:
-                                    screen.blit(time_up_surface, time_up_rect)
-                                    pygame.time.set_timer(
-                                        TIME_UP, time_up_message_duration
-                                    )
-                                    end_loop = False
-                                    while not end_loop:
-                                        for subsubevent in pygame.event.get():
-                                            if subsubevent.type == QUIT or (subsubevent.type == KEYUP and subsubevent.key in quit_keys):
-                                                generic.terminate(other_files)
-                                            elif subsubevent.type == TIME_UP:
-                                                pygame.time.set_timer(
-                                                    TIME_UP, 0
-                                                )
-                                                end_loop = True
-                                            else:
-                                                pass
-                                        try:
-                                            ticker.tick(frame_rate)
-                                        except AttributeError:
-                                            ticker = pygame.time.Clock()
-                                            ticker.tick(frame_rate)
-                                keep_testing = False
-                            elif subevent.type == KEYUP and subevent.key == K_y:
-                                finished_verifying = True
-                                keep_testing = False
-                            elif subevent.type == KEYUP and subevent.key == K_n:
-                                finished_verifying = True
-                                response = ""
-                                screen.blit(
-                                    original_surface,
-                                    (left_margin, top_margin, pixel_columns, pixel_rows)
-                                )
-                                screen.fill(background_colour, response_rect)
+                        # Sleep on the event queue until the subject answers.
+                        subevent = pygame.event.wait()
+                        if subevent.type == QUIT or (subevent.type == KEYUP and subevent.key in quit_keys):
+                            generic.terminate(other_files)
+                        elif subevent.type == TIME_UP:
+                            finished_verifying = True
+                            pygame.time.set_timer(TIME_UP, 0)
+                            screen.fill(background_colour)
+                            if time_up_message and time_up_message_duration > 0:
+                                screen.blit(time_up_surface, time_up_rect)
                                 pygame.display.update()
-                            else:
-                                pass
-                        try:
-                            ticker.tick(frame_rate)
-                        except AttributeError:
-                            ticker = pygame.time.Clock()
-                            ticker.tick(frame_rate)
+                                end = pygame.time.get_ticks()+time_up_message_duration
+                                time_left = time_up_message_duration
+                                while time_left > 0:
+                                    subsubevent = pygame.event.wait(time_left)
+                                    if subsubevent.type == QUIT or (subsubevent.type == KEYUP and subsubevent.key in quit_keys):
+                                        generic.terminate(other_files)
+                                    time_left = end-pygame.time.get_ticks()
+                            keep_testing = False
+                        elif subevent.type == KEYUP and subevent.key == K_y:
+                            finished_verifying = True
+                            keep_testing = False
+                        elif subevent.type == KEYUP and subevent.key == K_n:
+                            finished_verifying = True
+                            response = ""
+                            glyphs = []
+                            response_width = 0
+                            # The verification message replaced the whole
+                            # screen, so the whole screen is restored (without
+                            # the finished_string response) and updated.
+                            screen.blit(original_surface, (0, 0))
+                            screen.fill(background_colour, response_rect)
+                            pygame.display.update()
+                            response_rect = pygame.Rect(response_position, (0, 0))
+                        else:
+                            pass
                 else:
                     # response is not finished_string.
                     protocol.append(response)
                     response = ""
+                    glyphs = []
+                    response_width = 0
                     if show_previous_input:
+                        if on_screen:
+                            responses_height = responses_height+line_size
                         on_screen.append(protocol[-1])
+                        responses_height = (
+                            responses_height+text.string_size(protocol[-1], f)[1]
+                        )
                         # There needs to be room for another response or the
                         # earliest responses move off the screen.
-                        responses_height = text.height_of_strings(
-                            on_screen, f, line_size
-                        )
-                        if space_for_responses-responses-height-line_size < max_line_size:
-                            while space_for_responses-responses-height-line_size < max_line_size:
-                                del on_screen[0]
-                                responses_height = text.height_of_strings(
-                                    on_screen, f, line_size
+                        if space_for_responses-responses_height-line_size < max_line_height:
+                            while space_for_responses-responses_height-line_size < max_line_height:
+                                # Dropping the earliest line removes its height
+                                # and the gap below it.
+                                dropped = on_screen.pop(0)
+                                responses_height = (
+                                    responses_height-line_size-
+                                    text.string_size(dropped, f)[1]
                                 )
-                                new_surface, new_rect = text.render_lines(
-                                    on_screen, f, text_colour, background_colour,
-                                    line_size = line_size,
-                                    use_antialias = antialias
+                            # The remaining responses are drawn, and the display
+                            # updated, once, after the loop: one update of the
+                            # responses' area is cheaper than one per line dropped.
+                            new_surface, new_rect = text.render_lines(
+                                on_screen, f, text_colour, background_colour,
+                                line_size = line_size, use_antialiasing = antialias
+                            )
+                            if prompt_rect is not None:
+                                new_rect.topleft = (
+                                    left_margin, prompt_rect.bottom+line_size
                                 )
-                                try:
-                                    new_rect.topleft = (
-                                        prompt_rect.left,
-                                        prompt_rect.bottom+line_size
-                                    )
-                                except NameError:
-                                    new_rect.topleft = (left_margin, top_margin)
-                                screen.blit(new_surface, new_rect)
-                                try:
-                                    response_position = (prompt_rect.left, top_margin+prompt_rect.height+line_size+responses_height)
-                                except NameError:
-                                    response_position = (left_margin, top_margin+responses_height+line_size)
-                                pygame.display.update()
+                            else:
+                                new_rect.topleft = (left_margin, top_margin)
+                            # Clear everything from the responses down, as there
+                            # are now fewer lines than before:
+                            responses_area = pygame.Rect(
+                                new_rect.left, new_rect.top,
+                                screen_width-new_rect.left,
+                                screen_height-new_rect.top
+                            )
+                            screen.fill(background_colour, responses_area)
+                            screen.blit(new_surface, new_rect)
+                            response_position = (
+                                new_rect.left, new_rect.bottom+line_size
+                            )
+                            pygame.display.update(responses_area)
                         else:
                             # There is room for this response.
                             response_surface, response_rect = text.render_string(
@@ -1979,38 +2407,69 @@ decreasing the font size."
                                 background_colour, antialias
                             )
                             response_rect.topleft = response_position
-                            response_position[1] = response_rect.bottom+line_size
+                            response_position = (
+                                response_position[0],
+                                response_rect.bottom+line_size
+                            )
                             screen.blit(response_surface, response_rect)
                             pygame.display.update(response_rect)
                     else:
                         # Previous responses are not shown.
                         screen.fill(background_colour, response_rect)
                         pygame.display.update(response_rect)
-            elif event.type == KEYUP and event.key in allowed_keys:
+                    # The next response starts out empty at response_position:
+                    response_rect = pygame.Rect(response_position, (0, 0))
+            elif event.type == KEYDOWN and event.key in key_names:
                 # Another letter has been added to response.
-                response = response+pygame.key.name(event.key)
-                response_surface, response_rect = text.render_string(
-                    response, f, text_colour, background_colour, antialias
+                character = key_names[event.key]
+                response = response+character
+                glyph_surface, glyph_rect = text.render_string(
+                    character, f, text_colour, background_colour, antialias
+                )
+                glyphs.append((glyph_surface, glyph_rect))
+                response_width = response_width+glyph_rect.width
+                if show_previous_input:
+                    # Only the new glyph is drawn, after the rest of response.
+                    glyph_rect.topleft = response_rect.topright
+                    screen.blit(glyph_surface, glyph_rect)
+                    pygame.display.update(glyph_rect)
+                    response_rect.size = (response_width, response_height)
+                else:
+                    # The centred response shifts, so it is composed again.
+                    redraw = True
+            if redraw:
+                response_surface = pygame.Surface(
+                    (response_width, response_height)
                 )
+                response_surface.fill(background_colour)
+                glyph_positions = []
+                x = 0
+                for glyph_surface, glyph_rect in glyphs:
+                    glyph_positions.append((glyph_surface, (x, 0)))
+                    x = x+glyph_rect.width
+                response_surface.blits(glyph_positions, doreturn = False)
+                old_rect = response_rect
+                response_rect = response_surface.get_rect()
                 if show_previous_input:
                     response_rect.topleft = response_position
                 else:
                     response_rect.center = response_position
-                screen.fill(background_colour, response_rect)
+                screen.fill(background_colour, old_rect)
                 screen.blit(response_surface, response_rect)
-                pygame.display.update(response_rect)
-        try:
-            ticker.tick(frame_rate)
-        except AttributeError:
-            ticker = pygame.time.Clock()
-            ticker.tick(frame_rate)
+                pygame.display.update(old_rect.union(response_rect))
+                redraw = False
+    finally:
+        pygame.key.set_repeat(*previous_repeat)
+        pygame.event.set_allowed(blocked)
     
     # Write protocol, if necessary:
     if data_file:
         data_file = writing.ready_file_for_writing(data_file)
-        data_file.write("output_position,response\n")
-        for i in xrange(len(protocol)):
-            data_file.write("{:d},{:s}\n".format(i+1, protocol[i]))
+        # The table is built as a list of lines and written in one call.
+        lines = ["output_position,response"]
+        for i, response in enumerate(protocol):
+            lines.append("{:d},{:s}".format(i+1, response))
+        data_file.write("\n".join(lines)+"\n")
         if close_data_file:
             data_file.close()
     return protocol
@@ -2222,6 +2681,15 @@ def free_recall(targets, stim_duration, isi_duration, study_instructions, test_i
                 "distractor": This entry only appears if distractor is True.
                     It is a dictionary with entries for "lines" and "losses".
     """
+    if clock is None:
+        # One clock is shared by all of the phases below.
+        clock = pygame.time.Clock()
+    # The key collections are only tested for membership, so they are made
+    # frozensets once, here, before being passed on:
+    response_keys = frozenset(response_keys)
+    continue_keys = frozenset(continue_keys)
+    backward_keys = frozenset(backward_keys)
+    exit_keys = frozenset(exit_keys)
     recall_responses = []
     results = []
     if distractor:
@@ -2237,7 +2705,7 @@ def free_recall(targets, stim_duration, isi_duration, study_instructions, test_i
                 # Get instruction_font from a Stimulus object:
                 instruction_font = targets[0].font
     if not instruction_line_size:
-        instruction_line_size = instruction_font.get_linesize()
+        instruction_line_size = text.line_size(instruction_font)
     
     if randomize:
         if stim_fonts:
@@ -2251,59 +2719,44 @@ def free_recall(targets, stim_duration, isi_duration, study_instructions, test_i
     
     # Create a list of Stimulus objects for targets if one does not already
     # exist:
-    try:
-        # targets might be a file.
+    if isinstance(targets, (str, bytes, os.PathLike)):
+        # targets is a file name.
         with open(targets) as target_file:
-            targets = target_file.readlines()
-        targets = [target.strip() for target in targets]
-    except TypeError:
-        # targets is not a file.
-        pass
-    
-    # Convert any non-Stimulus objects from targets to Stimulus objects:
-    for i in xrange(len(targets)):
+            targets = [line.strip() for line in target_file]
+    
+    # Convert any non-Stimulus objects from targets to Stimulus objects,
+    # pairing each with its font, colours, and location; whether each setting
+    # comes from a list or a single value is decided once, here, rather than
+    # for every target:
+    target_count = len(targets)
+    target_settings = zip(
+        stim_fonts or [stim_font]*target_count,
+        stim_colours or [stim_colour]*target_count,
+        stim_backgrounds or [stim_background]*target_count,
+        stim_locations or [stim_location]*target_count
+    )
+    for i, settings in enumerate(target_settings):
         target = targets[i]
-        if not isinstance(target, Stimulus):
-            if stim_fonts:
-                target_font = targets[i]
-            elif i == 0:
-                target_font = stim_font
-            if stim_colours:
-                target_colour = stim_colours[i]
-            elif i == 0:
-                target_colour = stim_colour
-            if stim_backgrounds:
-                target_background = stim_backgrounds[i]
-            elif i == 0:
-                target_background = stim_background
-            if stim_case == "u" and not target.isupper():
-                target = target.upper()
-            elif stim_case == "l" and not target.islower():
-                target = target.lower()
-            if stim_locations:
-                target_location = stim_location
-                try:
-                    pixel_x, pixel_y = target_location
-                except ValueError:
-                    pixel_x, pixel_y = get_position(
-                        target_location, target, target_font, top_margin,
-                        right_margin, bottom_margin, left_margin
-                    )
-            elif (i == 0 and not stim_fonts) or stim_fonts:
-                target_location = stim_location
-                try:
-                    pixel_x, pixel_y = target_location
-                except ValueError:
-                    pixel_x, pixel_y = get_position(
-                        target_location, target, target_font, top_margin,
-                        right_margin, bottom_margin, left_margin
-                    )
-            new_target = Stimulus(
-                target, target_font, colour = target_colour,
-                background = target_background,
-                antialiasing = antialiasing, x = pixel_x, y = pixel_y
+        if isinstance(target, Stimulus):
+            continue
+        target_font, target_colour, target_background, target_location = settings
+        if stim_case == "u" and not target.isupper():
+            target = target.upper()
+        elif stim_case == "l" and not target.islower():
+            target = target.lower()
+        # target_location should either be x-y coordinates or a string.
+        if isinstance(target_location, str):
+            pixel_x, pixel_y = get_position(
+                target_location, target, target_font, top_margin,
+                right_margin, bottom_margin, left_margin
             )
-            targets[i] = new_target
+        else:
+            pixel_x, pixel_y = target_location
+        targets[i] = Stimulus(
+            target, target_font, colour = target_colour,
+            background = target_background, antialiasing = antialiasing,
+            x = pixel_x, y = pixel_y
+        )
     
     # ISI cleanup, if necessary:
     if isi_duration > 0 and isi_string and not isi_font:
@@ -2324,7 +2777,7 @@ targets_per_block must sum to the length of targets."
                 target_count = 0
                 for list_length in targets_per_block:
                     current_study_list = []
-                    for i in xrange(list_length):
+                    for i in range(list_length):
                         current_study_list.append(targets[target_count])
                         target_count = target_count+1
                     study_lists.append(current_study_list)
@@ -2333,109 +2786,82 @@ targets_per_block must sum to the length of targets."
 not evenly divide into the specified number of blocks."
                 list_length = len(targets)//blocks
                 target_count = 0
-                for i in xrange(blocks):
+                for i in range(blocks):
                     current_study_list = []
-                    for j in xrange(list_length):
+                    for j in range(list_length):
                         current_study_list.append(targets[j])
                     study_lists.append(current_study_list)
         else:
             # Conditions need to be balanced.
-            # Get a dict of conditions with the number of time each occurs in
-            # targets:
-            conditions = {}
+            # Sort targets by condition in a single pass, keeping conditions
+            # in the order in which they first appear:
+            targets_by_condition = OrderedDict()
             for target in targets:
                 current_condition = target.condition
                 if isinstance(current_condition, list):
                     current_condition = tuple(current_condition)
                     # necessary because dicts do not allow list keys.
-                if current_condition not in conditions:
-                    conditions[current_condition] = 1
-                else:
-                    conditions[current_condition] = conditions[current_condition]+1
+                targets_by_condition.setdefault(
+                    current_condition, []
+                ).append(target)
             if not targets_per_block:
                 # Make sure balancing conditions is possible:
-                for key in conditions:
-                    assert conditions[key]%blocks == 0, "The number of \
-targets in each condition must evenly divide by the number of blocks."
-                # targets are deleted below, so create a copy:
-                targets_copy = copy_stimuli(targets)
-                for i in xrange(blocks):
+                for condition_targets in targets_by_condition.values():
+                    assert len(condition_targets)%blocks == 0, "The number \
+of targets in each condition must evenly divide by the number of blocks."
+                # Each block takes the next slice of each condition's targets.
+                for i in range(blocks):
                     current_study_list = []
-                    for key in conditions:
-                        to_delete_indices = []
-                        for j in xrange(len(targets_copy)):
-                            target = targets_copy[j]
-                            current_condition = target.condition
-                            if isinstance(current_condition, list):
-                                current_condition = tuple(current_condition)
-                            if current_condition == key:
-                                current_study_list.append(target)
-                                to_delete_indices.append(j)
-                                if len(to_delete_indices) == conditions[key]//blocks:
-                                    break
-                        for k in xrange(len(to_delete_indices)-1, -1, -1):
-                            index = to_delete_indices[k]
-                            del targets_copy[index]
+                    for condition_targets in targets_by_condition.values():
+                        per_block = len(condition_targets)//blocks
+                        current_study_list.extend(
+                            condition_targets[i*per_block:(i+1)*per_block]
+                        )
                     study_lists.append(current_study_list)
             else:
+                # The index reached in each condition's targets:
+                start = 0
                 for list_length in targets_per_block:
-                    assert list_length%len(conditions) == 0, "List lengths \
-in targets_per_block must evenly divide by the number of conditions."
+                    assert list_length%len(targets_by_condition) == 0, "List \
+lengths in targets_per_block must evenly divide by the number of conditions."
+                    per_condition = list_length//len(targets_by_condition)
                     current_study_list = []
-                    for key in conditions:
-                        to_delete_indices = []
-                        for j in xrange(len(targets_copy)):
-                            target = targets_copy[j]
-                            current_condition = target.condition
-                            if isinstance(current_condition, list):
-                                current_condition = tuple(current_condition)
-                            if current_condition == key:
-                                current_study_list.append(target)
-                                to_delete_indices.append(j)
-                                if len(to_delete_indices) == list_length%conditions:
-                                    break
-                        for k in xrange(len(to_delete_indices)-1, -1, -1):
-                            index = to_delete_indices[k]
-                            del targets_copy[index]
+                    for condition_targets in targets_by_condition.values():
+                        current_study_list.extend(
+                            condition_targets[start:start+per_condition]
+                        )
+                    start = start+per_condition
                     study_lists.append(current_study_list)
     
+    # Every instruction screen is shown with the same settings:
+    instruction_settings = dict(
+        proportion_width = 1-left_margin-right_margin,
+        proportion_height = 1-top_margin-bottom_margin,
+        main_line = instruction_line_size,
+        break_sentences = split_sentences_between_screens,
+        sentence_terminators = sentence_terminators,
+        terminator_exceptions = sentence_terminator_exclusions,
+        gap = lines_between_instructions_and_continue_message,
+        bottom_message = continue_instruction_message,
+        bottom_font = continue_instruction_font,
+        bottom_line = continue_instruction_line_size,
+        advance_keys = continue_keys, reverse_keys = backward_keys,
+        quit_keys = exit_keys, ticker = clock, frame_rate = frame_rate,
+        files = other_files
+    )
+    
     # Present preliminary_instructions (if applicable):
     for instructions in preliminary_instructions:
         text.display_text_until_keypress(
             instructions, instruction_font, instruction_colour,
-            instruction_background,
-            proportion_width = 1-left_margin-right_margin,
-            proportion_height = 1-top_margin-bottom_margin,
-            main_line = instruction_line_size,
-            break_sentences = split_sentences_between_screens,
-            sentence_terminators = sentence_terminators,
-            terminator_exceptions = sentence_terminator_exclusions,
-            gap = lines_between_instructions_and_continue_message,
-            bottom_message = continue_instruction_message,
-            bottom_font = continue_instruction_font,
-            bottom_line = continue_instruction_line_size,
-            advance_keys = continue_keys, reverse_keys = backward_keys,
-            quit_keys = exit_keys, ticker = clock, frame_rate = frame_rate,
-            files = other_files
+            instruction_background, **instruction_settings
         )
     
     for study_list in study_lists:
         # Show study_instructions:
         text.display_text_until_keypress(
             study_instructions, instruction_font, instruction_colour,
-            instruction_background,
-            proportion_width = 1-left_margin-right_margin,
-            proportion_height = 1-top_margin-bottom_margin,
-            main_line = instruction_line_size,
-            break_sentences = split_sentences_between_screens,
-            sentence_terminators = sentence_terminators,
-            terminator_exceptions = sentence_terminator_exclusions,
-            gap = lines_between_instructions_and_continue_message,
-            bottom_message = continue_instruction_message,
-            bottom_font = continue_instruction_font,
-            bottom_line = instruction_line_size, advance_keys = continue_keys,
-            reverse_keys = backward_keys, quit_keys = exit_keys,
-            ticker = clock, frame_rate = frame_rate, files = other_files
+            instruction_background, **instruction_settings
         )
         # Now the study phase itself:
         single_item_study_phase(
@@ -2450,19 +2876,7 @@ in targets_per_block must evenly divide by the number of conditions."
             text.display_text_until_keypress(
                 distraction_instructions, instruction_font,
                 instruction_colour, instruction_background,
-                proportion_width = 1-left_margin-right_margin,
-                proportion_height = 1-top_margin-bottom_margin,
-                main_line = instruction_line_size,
-                break_sentences = split_sentences_between_screens,
-                sentence_terminators = sentence_terminators,
-                terminator_exceptions = sentence_terminator_exclusions,
-                gap = lines_between_instructions_and_continue_message,
-                bottom_message = continue_instruction_message,
-                bottom_font = continue_instruction_font,
-                bottom_line = continue_instruction_line_size,
-                advance_keys = continue_keys, reverse_keys = backward_keys,
-                quit_keys = exit_keys, ticker = clock,
-                frame_rate = frame_rate, files = other_files
+                **instruction_settings
             )
             lines_formed, times_lost = tetromino.distractor(
                 distraction_duration/1000, instruction_font,
@@ -2478,20 +2892,7 @@ in targets_per_block must evenly divide by the number of conditions."
             losses.append(times_lost)
         text.display_text_until_keypress(
             test_instructions, instruction_font, instruction_colour,
-            instruction_background,
-            proportion_width = 1-left_margin-right_margin,
-            proportion_height = 1-top_margin-bottom_margin,
-            main_line = instruction_line_size,
-            break_sentences = split_sentences_between_screens,
-            sentence_terminators = sentence_terminators,
-            terminator_exceptions = sentence_terminator_exclusions,
-            gap = lines_between_instructions_and_continue_message,
-            bottom_message = continue_instruction_message,
-            bottom_font = continue_instruction_font,
-            bottom_line = continue_instruction_line_size,
-            advance_keys = continue_keys, reverse_keys = backward_keys,
-            quit_keys = exit_keys, ticker = clock,
-            frame_rate = frame_rate, files = other_files
+            instruction_background, **instruction_settings
         )
         recall_responses_i = free_recall_test(
             instruction_font, line_size = instruction_line_size,
@@ -2511,7 +2912,7 @@ in targets_per_block must evenly divide by the number of conditions."
         recall_responses.append(recall_responses_i)
     
     # Score results and fill the results list with dicts next.
-    for i in xrange(blocks):
+    for i in range(blocks):
         study_list = study_lists[i]
         response_list = recall_responses[i]
         dict_i = score.free_recall(study_list, response_list)
@@ -2522,158 +2923,145 @@ in targets_per_block must evenly divide by the number of conditions."
     
     # If there was more than one block, add dict collapsing across blocks:
     if blocks > 1:
-        all_stimuli = []
-        all_responses = []
-        for i in xrange(blocks):
-            all_stimuli = all_stimuli+study_lists[i]
-            all_responses = all_responses+recall_responses[i]
+        all_stimuli = list(itertools.chain.from_iterable(study_lists))
+        all_responses = list(itertools.chain.from_iterable(recall_responses))
         overall_dict = score.free_recall(all_stimuli, all_responses)
-        overall_dict[LINES] = sum(lines)
-        overall_dict[LOSSES] = sum(losses)
+        if distractor:
+            overall_dict[LINES] = sum(lines)
+            overall_dict[LOSSES] = sum(losses)
         results.append(overall_dict)
     
-    # Write any requested data to files:
+    # Write any requested data to files. The files covering every block are
+    # opened first; then each block's results are formatted once and written
+    # to all of the requested files in a single pass over the blocks:
+    if not distractor:
+        distractor_file = distractor_files = None
     if study_file:
         study_file = writing.ready_file_for_writing(study_file)
-        for i in xrange(blocks):
+    if distractor_file:
+        distractor_file = writing.ready_file_for_writing(distractor_file)
+    if protocol_file:
+        protocol_file = writing.ready_file_for_writing(protocol_file)
+    if intrusion_file:
+        intrusion_file = writing.ready_file_for_writing(intrusion_file)
+    if close_matches_file:
+        close_matches_file = writing.ready_file_for_writing(close_matches_file)
+    if results_file:
+        results_file = writing.ready_file_for_writing(results_file)
+    
+    for i in range(blocks):
+        study_list = study_lists[i]
+        result = results[i]
+        if study_file:
             study_file.write("Study list {:d} follows.\n".format(i+1))
             writing.study_phase(
                 study_list, study_file, close_when_finished = False
             )
             study_file.write("\n")
-        study_file.close()
-    
-    if study_files:
-        for i in xrange(blocks):
-            study_list = study_lists[i]
+        if study_files:
             writing.study_phase(study_list, study_files[i])
-    
-    if distractor_file and distractor:
-        distractor_file = writing.ready_file_for_writing(distractor_file)
-        for i in xrange(blocks):
+        
+        if distractor_file:
             distractor_file.write(
                 "For Block {:d}, this subject completed {:d} lines and lost \
-{:d} times.\n".format(
-                    i+1, lines[i], losses[i]
-                )
+{:d} times.\n".format(i+1, lines[i], losses[i])
             )
-        distractor_file.close()
-    
-    if distractor_files and distractor:
-        for i in xrange(blocks):
+        if distractor_files:
             current_file = writing.ready_file_for_writing(distractor_files[i])
             current_file.write(
                 "lines = {:d}\nlosses = {:d}".format(lines[i], losses[i])
             )
             current_file.close()
-    
-    if protocol_file:
-        protocol_file = writing.ready_file_for_writing(protocol_file)
-        for i in xrange(blocks):
-            protocol = results[i][ITEMS_RECALLED]
-            if protocol:
-                protocol_file.write(
-                    "The protocol for Block {:d} follows.\n".format(i+1)
-                )
-                writing.list_or_tuple(protocol_file, protocol, c = False)
-            else:
-                protocol_file.write(
-                    "No items were recalled for Block {:d}.\n".format(i+1)
+        
+        if protocol_file or protocol_files:
+            protocol = writing.list_or_tuple_string(result[ITEMS_RECALLED])
+            if protocol_file:
+                if protocol:
+                    protocol_file.write(
+                        "The protocol for Block {:d} follows.\n{:s}".format(
+                            i+1, protocol
+                        )
+                    )
+                else:
+                    protocol_file.write(
+                        "No items were recalled for Block {:d}.\n".format(i+1)
+                    )
+            if protocol_files:
+                current_file = writing.ready_file_for_writing(
+                    protocol_files[i]
                 )
-        protocol_file.close()
-    
-    if protocol_files:
-        for i in xrange(blocks):
-            current_file = protocol_files[i]
-            protocol = results[i][ITEMS_RECALLED]
-            if protocol:
-                writing.list_or_tuple(current_file, protocol)
-            else:
-                current_file = writing.ready_file_for_writing(current_file)
-                current_file.write("No items recalled.")
+                current_file.write(protocol or "No items recalled.")
                 current_file.close()
-    
-    if intrusion_file:
-        intrusion_file = writing.ready_file_for_writing(intrusion_file)
-        for i in xrange(blocks):
-            current_intrusions = results[i][INTRUSIONS]
-            if current_intrusions:
-                intrusion_file.write(
-                    "Intrusions for Block {:d} follow.\n".format(i+1)
-                )
-                writing.list_or_tuple(
-                    intrusion_file, current_intrusions, c = False
-                )
-            else:
-                intrusion_file.write(
-                    "There were no intrusions for Block {:d}.\n".format(i+1)
+        
+        if intrusion_file or intrusion_files:
+            current_intrusions = writing.list_or_tuple_string(
+                result[INTRUSIONS]
+            )
+            if intrusion_file:
+                if current_intrusions:
+                    intrusion_file.write(
+                        "Intrusions for Block {:d} follow.\n{:s}".format(
+                            i+1, current_intrusions
+                        )
+                    )
+                else:
+                    intrusion_file.write(
+                        "There were no intrusions for Block {:d}.\n".format(
+                            i+1
+                        )
+                    )
+            if intrusion_files:
+                current_file = writing.ready_file_for_writing(
+                    intrusion_files[i]
                 )
-        intrusion_file.close()
-    
-    if intrusion_files:
-        for i in xrange(blocks):
-            current_file = intrusion_files[i]
-            current_intrusions = results[i][INTRUSIONS]
-            if current_intrusions:
-                writing.list_or_tuple(current_file, current_intrusions)
-            else:
-                current_file = writing.ready_file_for_writing(current_file)
-                current_file.write("No intrusions.")
+                current_file.write(current_intrusions or "No intrusions.")
                 current_file.close()
-    
-    if close_matches_file:
-        close_matches_file = writing.ready_file_for_writing(close_matches_file)
-        for i in xrange(blocks):
-            close_ones = results[i][CLOSE_MATCHES]
-            if close_ones:
-                close_matches_file.write(
-                    "Block {:d} close matches follow.\n".format(i+1)
+        
+        if close_matches_file or close_matches_files:
+            close_ones = result[CLOSE_MATCHES]
+            close_matches = "".join(
+                "{:s}: {:s}\n".format(key, ", ".join(close_ones[key]))
+                for key in close_ones
+            )
+            if close_matches_file:
+                if close_matches:
+                    close_matches_file.write(
+                        "Block {:d} close matches follow.\n{:s}".format(
+                            i+1, close_matches
+                        )
+                    )
+                else:
+                    close_matches_file.write(
+                        "Block {:d} had no close matches.\n".format(i+1)
+                    )
+            if close_matches_files:
+                current_file = writing.ready_file_for_writing(
+                    close_matches_files[i]
                 )
-                for key in close_ones:
-                    close_matches_file.write(key+": ")
-                    for j in xrange(len(close_ones[key])):
-                        if j < len(close_ones[key])-1:
-                            close_matches_file.write(close_ones[key][j]+", ")
-                        else:
-                            close_matches_file.write(close_ones[key][j]+"\n")
-            else:
-                close_matches_file.write(
-                    "Block {:d} had no close matches.\n".format(i+1)
+                current_file.write(close_matches or "No close matches.")
+                current_file.close()
+        
+        if results_file or results_files:
+            result_string = writing.dict_string(result)
+            if results_file:
+                results_file.write(
+                    "Block {:d}\n{:s}\n\n".format(i+1, result_string)
                 )
-        close_matches_file.close()
-    
-    if close_matches_files:
-        for i in xrange(blocks):
-            current_file = close_matches_files[i]
-            current_file = writing.ready_file_for_writing(current_file)
-            close_ones = results[i][CLOSE_MATCHES]
-            if close_ones:
-                for key in close_ones:
-                    current_file.write("{:s}: ".format(key))
-                    for j in xrange(len(close_ones[key])):
-                        if j < len(close_ones[key])-1:
-                            current_file.write(close_ones[key][j]+", ")
-                        else:
-                            current_file.write(close_ones[key][j]+"\n")
-            else:
-                current_file = writing.ready_file_for_writing(current_file)
-                current_file.write("No close matches.")
+            if results_files:
+                current_file = writing.ready_file_for_writing(results_files[i])
+                current_file.write(result_string)
                 current_file.close()
     
-    if results_file:
-        results_file = writing.ready_file_for_writing(results_file)
-        for i in xrange(blocks):
-            results_file.write("Block {:d}\n".format(i+1))
-            writing.write_dict(results[i], results_file, False)
-            results_file.write("\n\n")
-        if blocks > 1:
-            results_file.write("Collapsing across block:")
-            writing.write_dict(results[blocks], results_file)
-    
-    if results_files:
-        for i in xrange(blocks):
-            current_file = results_files[i]
-            writing.write_dict(results[i], current_file)
+    if results_file and blocks > 1:
+        results_file.write(
+            "Collapsing across block:"+writing.dict_string(results[blocks])
+        )
+    for file_ in (
+        study_file, distractor_file, protocol_file, intrusion_file,
+        close_matches_file, results_file
+    ):
+        if file_:
+            file_.close()
     return results
 
 
@@ -2716,59 +3104,62 @@ def generate_word_pairs(words, illegal_pairs = (), max_attempts = 100, relatedne
         with open(illegal_pairs) as file_:
             illegal_pairs = file_.readlines()
         illegal_pairs = [pair.split() for pair in illegal_pairs]
+    # Pairs are illegal in either order, so each is stored as a frozenset;
+    # checking a candidate pair is then a single hash lookup:
+    # (cued_recall_study passes None when there are no illegal pairs.)
+    illegal_pairs = frozenset(
+        frozenset(pair) for pair in illegal_pairs or ()
+    )
     if relatedness_matrix:
         with open(relatedness_matrix) as file_:
-            matrix_ = file_.readlines()
-        matrix_ = [line.strip() for line in matrix_]
-        matrix_ = [line.split(sep) for line in matrix_]
-        # Get the number of columns and rows (saves len() overhead):
-        columns_and_rows = len(matrix_[1])
-        if len(matrix_[0]) == columns_and_rows-1:
-            # Add dummy value to equalize:
-            matrix_[0].insert(0, None)
-        elif len(matrix_[0]) != columns_and_rows:
+            header = file_.readline().strip().split(sep)
+            rows = file_.readlines()
+        # Get the number of columns and rows from the first row of values:
+        columns_and_rows = len(rows[0].strip().split(sep))
+        if len(header) == columns_and_rows:
+            # The first entry heads the column of words; drop it:
+            header = header[1:]
+        elif len(header) != columns_and_rows-1:
             raise ValueError("Something is wrong with the similarity matrix.")
-        assert all(len(row) == columns_and_rows for row in matrix_[1:]), \
-"Something is wrong with the relatedness_matrix file. The number of rows \
-isn't adding up."
-        assert len(matrix_) == columns_and_rows, "The number of columns \
+        # Map each word to its row/column in the matrix:
+        word_indices = {word: index for index, word in enumerate(header)}
+        try:
+            matrix_ = np.loadtxt(
+                rows, delimiter = sep, comments = None,
+                usecols = range(1, columns_and_rows), ndmin = 2
+            )
+        except ValueError:
+            raise ValueError("Something is wrong with the relatedness_matrix \
+file. The number of rows isn't adding up.")
+        assert len(matrix_) == columns_and_rows-1, "The number of columns \
 doesn't add up in the relatedness_matrix file."
-        # Convert matrix_ to a dict:
-        matrix_dict = {}
-        for i in xrange(1, columns_and_rows):
-            key_i = matrix_[0][i]
-            matrix_dict[key_i] = {}
-            for j in xrange(1, columns_and_rows):
-                key_j = matrix_[0][j]
-                matrix_dict[key_i][key_j] = float(matrix_[i][j])
-    
-    number_of_pairs = len(words)//2
+    
+    words = np.asarray(words)
+    if relatedness_matrix:
+        # Each word's row/column in matrix_, in the same order as words:
+        word_rows = np.array([word_indices[word] for word in words.tolist()])
     i = 0
     while i < max_attempts:
-        word_pairs = np.random.choice(
-            words, size = (number_of_pairs, 2), replace = False
-        )
+        i = i+1
+        # Shuffle the words' indices and read them off two at a time:
+        pair_indices = np.random.permutation(len(words)).reshape(-1, 2)
+        if relatedness_matrix:
+            # Look up every pair's relatedness at once:
+            relatedness = matrix_[
+                word_rows[pair_indices[:, 0]], word_rows[pair_indices[:, 1]]
+            ]
+            if (relatedness >= cutoff).any():
+                continue
         # Regular tuples are better for Boolean comparisons than numpy arrays.
-        word_pairs = generic.convert_to_tuple(word_pairs)
-        if illegal_pairs or relatedness_matrix:
-            works = True   # until proven otherwise
-            for word_pair in word_pairs:
-                if any(current_pair in illegal_pairs for current_pair in (word_pair, list(word_pair), [word_pair[1], word_pair[0]], (word_pair[1], word_pair[0]))):
-                    works = False
-                    break
-                if relatedness_matrix:
-                    word1_key, word2_key = word_pair
-                    relatedness = matrix_dict[word1_key][word2_key]
-                    if relatedness >= cutoff:
-                        works = False
-                        break
-        try:
-            if works:
-                return word_pairs
-            else:
-                i = i+1
-        except NameError:
-            return word_pairs
+        word_pairs = tuple(zip(
+            words[pair_indices[:, 0]].tolist(),
+            words[pair_indices[:, 1]].tolist()
+        ))
+        if illegal_pairs and any(
+            frozenset(word_pair) in illegal_pairs for word_pair in word_pairs
+        ):
+            continue
+        return word_pairs
     # Reaching this points means max_attempts were made without success.
     raise ValueError("The word pairs couldn't be created.")
     return
@@ -2873,7 +3264,7 @@ def cued_recall_study(stimuli, duration, distance = 135, horizontal = True, bala
     # stimuli could be a file, a string pointing to a file, a list of WordPair
     # objects, a list of word pairs, or a list of single words.
     # There's probably a more elegant way of doing this with try/except...
-    if (isinstance(stimuli, (list, tuple)) and isinstance(stimuli[0], str)) or (isinstance(stimuli, (str, file))):
+    if (isinstance(stimuli, (list, tuple)) and isinstance(stimuli[0], str)) or (isinstance(stimuli, (str, io.IOBase))):
         return_stimuli = True
         stimuli = generate_word_pairs(
             stimuli, illegal_pairs, relatedness_matrix = similarity_matrix,
@@ -2883,15 +3274,9 @@ def cued_recall_study(stimuli, duration, distance = 135, horizontal = True, bala
     if isinstance(stimuli[0], (list, tuple)):
         return_stimuli = True
         if case == "u":
-            for i in xrange(len(stimuli)):
-                for j in xrange(2):
-                    if not stimuli[i][j].upper():
-                        stimuli[i][j] = stimuli[i][j].upper()
+            stimuli = [(item1.upper(), item2.upper()) for item1, item2 in stimuli]
         elif case == "l":
-            for i in xrange(len(stimuli)):
-                for j in xrange(2):
-                    if not stimuli[i][j].islower():
-                        stimuli[i][j] = stimuli[i][j].lower()
+            stimuli = [(item1.lower(), item2.lower()) for item1, item2 in stimuli]
         if randomize:
             try:
                 np.random.shuffle(stimuli)
@@ -2917,56 +3302,40 @@ def cued_recall_study(stimuli, duration, distance = 135, horizontal = True, bala
                 except TypeError:
                     stim_backgrounds = list(stim_backgrounds)
                     np.random.shuffle(stim_backgrounds)
+        # Decide, for every pair, whether its first item is the target:
+        pair_count = len(stimuli)
         if balance_targets:
-            first = len(stimuli)//2
-            second = first
-            if len(stimuli)%2 == 1:
-                extra_goes_to = np.random.choice(("first", "second"))
-                if extra_goes_to == "first":
-                    first = first+1
-                else:
-                    second = second+1
-        # Create WordPair objects:
-        for i in xrange(len(stimuli)):
-            item1, item2 = stimuli[i]
-            if balance_targets:
-                if first and second:
-                    target_item, cue_item = np.random.choice(
-                        (item1, item2), 2, False
-                    )
-                    if target_item == item1:
-                        first = first-1
-                    else:
-                        second = second-1
-                elif first:
-                    target_item = item1
-                    cue_item = item2
-                else:
-                    target_item = item2
-                    cue_item = item1
+            first = pair_count//2
+            if pair_count%2 == 1:
+                # The extra target goes to a randomly chosen side:
+                first = first+np.random.randint(2)
+            target_is_first = np.zeros(pair_count, dtype = bool)
+            target_is_first[:first] = True
+            np.random.shuffle(target_is_first)
+        else:
+            target_is_first = np.random.randint(2, size = pair_count) == 1
+        # Create WordPair objects, pairing each with its font and colours:
+        pair_settings = zip(
+            stimuli, target_is_first,
+            stim_fonts or [stim_font]*pair_count,
+            stim_colours or [stim_colour]*pair_count,
+            stim_backgrounds or [stim_background]*pair_count
+        )
+        word_pairs = []
+        for settings in pair_settings:
+            (item1, item2), first_is_target, current_font, current_colour, current_background = settings
+            if first_is_target:
+                target_item, cue_item = item1, item2
             else:
-                target_item, cue_item = np.random.choice(
-                    (item1, item2), 2, False
-                )
-            if stim_fonts:
-                current_font = stim_fonts[i]
-            elif i == 0:
-                current_font = stim_font
-            if stim_colours:
-                current_colour = stim_colours[i]
-            elif i == 0:
-                current_colour = stim_colour
-            if stim_backgrounds:
-                current_background = stim_backgrounds[i]
-            elif i == 0:
-                current_background = stim_background
-            stimuli[i] = WordPair(
+                target_item, cue_item = item2, item1
+            word_pairs.append(WordPair(
                 item1, item2, current_font, apart = distance,
                 left_to_right = horizontal, cue = cue_item,
                 target = target_item, colour = current_colour,
                 background = current_background,
                 antialiasing = use_antialiasing
-            )
+            ))
+        stimuli = word_pairs
     if not isi_object and isi_duration:
         if isi_fixation:
             if not isi_font:
@@ -2980,17 +3349,14 @@ def cued_recall_study(stimuli, duration, distance = 135, horizontal = True, bala
             isi_antialiasing, location = isi_location
         )
     if scale:
-        screen = pygame.display.get_surface()
-        try:
-            screen_width, screen_height = screen.get_size()
-        except AttributeError:
-            screen_width, screen_height = pygame.display.list_modes()[0]
-        scale.rect.top = screen_height-scale.rect.height-scale.font.get_linesize()
+        screen_width, screen_height = text.screen_dimensions()
+        scale.rect.top = screen_height-scale.rect.height-text.line_size(scale.font)
         scale.rect.left = screen_width//2-scale.rect.width//2
     
+    prerender(stimuli)
+    
     # Present study phase:
-    for i in xrange(len(stimuli)):
-        word_pair = stimuli[i]
+    for i, word_pair in enumerate(stimuli):
         left_over_time = word_pair.study(
             duration, scale, end_after_input = end_trial_after_scale_input,
             ticker = timer, frame_rate = fps, exit_keys = keys_to_quit,
@@ -3074,6 +3440,8 @@ be overlap between allowed_keys and keys_to_quit."
             isi_antialiasing, isi_location
         )
     
+    prerender(stimuli)
+    
     # Test phase now:
     for word_pair in stimuli:
         word_pair.test(allowed_keys, timer, fps, keys_to_quit, other_files)
@@ -3114,14 +3482,23 @@ def rate_images(images, response_keys = NUMBERS, start_after = 0, end_after = No
             to an empty tuple.
     """
     assert frame_rate > 0, "frame_rate must be positive."
-    screen = pygame.display.get_surface()
-    for i in xrange(len(images)):
-        image = images[i]
-        image.rate(
+    # Without an ISI, only the previous image's rect needs to be cleared, as
+    # long as the background colour stays the same:
+    previous_rects = None
+    previous_background = None
+    for i, image in enumerate(images):
+        background = tuple(image.background)
+        if background != previous_background:
+            previous_rects = None
+        previous_background = background
+        image_rect = image.rate(
             allowed_keys = response_keys, begin_time = start_after,
             finish_time = end_after, c = ticker, fps = frame_rate,
-            exit_keys = quit_keys, files = files
+            exit_keys = quit_keys, files = files,
+            update_rects = previous_rects
         )
         if isi and i < len(images)-1:
             isi.present()
+        elif not isi:
+            previous_rects = [image_rect]
     return
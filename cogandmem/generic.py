@@ -17,6 +17,10 @@ single pygame.Rect object.
 in future versions).
     convert_to_list: convert an iterable to a list (probably will be removed
 in future versions).
+    copy_if_mutable: deep copy lists, dicts, and sets; return anything else
+as is.
+    block_events: keep pygame event types off the event queue, returning those
+newly blocked.
     seconds_to_milliseconds: get the number of milliseconds in a given number
 of seconds.
     milliseconds_to_seconds: get the number of seconds in a given number of
@@ -27,6 +31,7 @@ current local time.
 
 import sys
 import os
+import copy
 import numpy
 import time
 
@@ -162,6 +167,41 @@ def convert_to_list(array_):
     return as_list
 
 
+def copy_if_mutable(value):
+    """
+    Return a deep copy of value if it is a list, dict, or set; otherwise,
+    return value itself.
+    
+    This is used when copying stimuli: colours, strings, and numbers are
+    almost always immutable, so deep copying them is wasted effort.
+    """
+    if isinstance(value, (list, dict, set)):
+        return copy.deepcopy(value)
+    return value
+
+
+def block_events(event_types):
+    """
+    Block those of event_types that are not already blocked, so that they are
+    dropped before reaching the event queue rather than being fetched only to
+    be ignored.
+    
+    Parameters:
+        event_types: a list or tuple of pygame event types.
+    
+    Returns:
+        blocked: a list of the event types newly blocked; pass it to
+            pygame.event.set_allowed() to undo the change.
+    """
+    blocked = [
+        event_type for event_type in event_types
+        if not pygame.event.get_blocked(event_type)
+    ]
+    if blocked:
+        pygame.event.set_blocked(blocked)
+    return blocked
+
+
 def seconds_to_milliseconds(seconds):
     """
     Convert seconds to milliseconds.
@@ -187,7 +227,7 @@ def date_time_string():
     date_and_time = ""
     # Convert ints to strings, add leading 0s if necessary, and then add to
     # date_and_time:
-    for i in xrange(6):
+    for i in range(6):
         if i < 5:
             unit_to_add = str(current_time[i])+"."
             if len(unit_to_add) == 2:
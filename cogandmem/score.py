@@ -9,8 +9,6 @@ functions for more information):
 serial position.
 """
 
-from __future__ import division
-
 import difflib
 import copy
 
@@ -79,7 +77,7 @@ def free_recall(targets, responses):
         try:
             conditions = []
             denominators = {}
-            for i in xrange(len(targets)):
+            for i in range(len(targets)):
                 target = targets[i]
                 current_condition = target.condition
                 targets_as_strings.append(target.word)
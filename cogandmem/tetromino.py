@@ -74,8 +74,6 @@ screen.
     distractor: present Tetromino as a distractor task.
 """
 
-from __future__ import division
-
 import sys
 import numpy as np
 import time
@@ -83,9 +81,9 @@ import time
 import pygame
 from pygame.locals import *
 
-import experiment
-import text
-import generic
+from . import experiment
+from . import text
+from . import generic
 
 
 # Game Constants:
@@ -174,12 +172,8 @@ def get_board_boundaries(cell_size, pixels_at_bottom, columns = 10, rows = 20):
     Return the coordinates of the top left corner of a game board given the
     cell size and the number of blank pixel rows at the bottom of the screen.
     """
-    screen = pygame.display.get_surface()
-    try:
-        screen_width, screen_height = screen.get_size()
-    except AttributeError:
-        screen = pygame.display.set_mode(pygame.display.list_modes()[0])
-        screen_width, screen_height = screen.get_size()
+    screen = text.get_screen()
+    screen_width, screen_height = screen.get_size()
     x = (screen_width-columns*cell_size)//2
     y = screen_height-rows*cell_size-pixels_at_bottom
     return x, y
@@ -218,12 +212,8 @@ def fit_board_to_screen(blank_horizontal, blank_top, blank_bottom, top = (), lef
         x: the pixel coordinate of the left edge of the game board.
         y: the pixel coordinate of the top edge of the game board.
     """
-    screen = pygame.display.get_surface()
-    try:
-        screen_width, screen_height = screen.get_size()
-    except AttributeError:
-        screen = pygame.display.set_mode(pygame.display.list_modes()[0])
-        screen_width, screen_height = screen.get_size()
+    screen = text.get_screen()
+    screen_width, screen_height = screen.get_size()
     
     max_width = int(screen_width-blank_horizontal*screen_width)
     max_height = int(screen_height-blank_top*screen_height-blank_bottom*screen_height)
@@ -377,8 +367,8 @@ class Piece:
     
     def add_to_board(self, b):
         """Add the Piece object to the game board (b)."""
-        for x in xrange(TEMPLATE_WIDTH):
-            for y in xrange(TEMPLATE_HEIGHT):
+        for x in range(TEMPLATE_WIDTH):
+            for y in range(TEMPLATE_HEIGHT):
                 # Check if this x-y coordinate needs colour:
                 if PIECES[self.shape][self.orientation][y][x] != BLANK:
                     b.state[x+self.x][y+self.y] = self.colour
@@ -386,8 +376,8 @@ class Piece:
     def is_valid_position(self, b, x_adjustment = 0, y_adjustment = 0):
         """Return True if a Piece's location is valid."""
         valid = True
-        for x in xrange(TEMPLATE_WIDTH):
-            for y in xrange(TEMPLATE_HEIGHT):
+        for x in range(TEMPLATE_WIDTH):
+            for y in range(TEMPLATE_HEIGHT):
                 is_above_board = y+self.y+y_adjustment < 0
                 if is_above_board or PIECES[self.shape][self.orientation][y][x] == BLANK:
                     continue
@@ -444,7 +434,7 @@ class Piece:
     
     def move_to_bottom(self, b):
         """Move the piece to the bottom of the game board (b)."""
-        for i in xrange(1, b.rows):
+        for i in range(1, b.rows):
             if not self.legal_down(b):
                 # The ith row is blocked.
                 break
@@ -492,8 +482,8 @@ class Piece:
             # Convert to pixels:
             x_coord, y_coord = b.board_to_pixels(x_coord, y_coord)
         shape_to_draw = PIECES[self.shape][self.orientation]
-        for x in xrange(TEMPLATE_WIDTH):
-            for y in xrange(TEMPLATE_HEIGHT):
+        for x in range(TEMPLATE_WIDTH):
+            for y in range(TEMPLATE_HEIGHT):
                 if shape_to_draw[y][x] != BLANK:
                     b.draw_box(
                         x_coord+x*b.cell_size, y_coord+y*b.cell_size,
@@ -559,7 +549,7 @@ class GameBoard:
         self.columns = 10
         self.rows = 20
         self.state = []
-        for x in xrange(columns):
+        for x in range(columns):
             column = [BLANK]*rows
             self.state.append(column)
         self.left = left
@@ -569,7 +559,7 @@ class GameBoard:
     def reset(self):
         """Reset the game board."""
         self.state = []
-        for x in xrange(self.columns):
+        for x in range(self.columns):
             column = [BLANK]*self.rows
             self.state.append(column)
     
@@ -581,7 +571,7 @@ class GameBoard:
     
     def is_complete_line(self, y):
         """Return True if Row y is a complete line and False otherwise."""
-        for x in xrange(self.columns):
+        for x in range(self.columns):
             current_cell = self.state[x][y]
             if current_cell == BLANK:
                 # The line is not complete.
@@ -598,11 +588,11 @@ class GameBoard:
         while y >= 0:
             if self.is_complete_line(y):
                 # Remove the complete line and pull higher lines down a row:
-                for pull_down_y in xrange(y, 0, -1):
-                    for x in xrange(self.columns):
+                for pull_down_y in range(y, 0, -1):
+                    for x in range(self.columns):
                         self.state[x][pull_down_y] = self.state[x][pull_down_y-1]
                 # Set very top line to blank:
-                for x in xrange(self.columns):
+                for x in range(self.columns):
                     self.state[x][0] = BLANK
                 lines = lines+1
             else:
@@ -655,8 +645,8 @@ parameter must be "box" or "pixel".'
                 self.rows*self.cell_size+8
             ), 5
         )
-        for column in xrange(self.columns):
-            for row in xrange(self.rows):
+        for column in range(self.columns):
+            for row in range(self.rows):
                 self.draw_box(column, row, self.state[column][row])
 
 
@@ -783,6 +773,8 @@ def distractor(duration, game_font, columns = 10, rows = 20, top_exclude = 0.025
         losses: the number of times the pieces reached the top of the game
             board.
     """
+    if c is None:
+        c = pygame.time.Clock()
     assert columns > 4 and rows > 4, "The columns and rows variables must \
 exceed 4."
     assert fps > 0, "Frame rate (fps) must be positive."
@@ -792,12 +784,8 @@ bottom_exclude must be between 0 and 1."
 right_exclude must be between 0 and 1."
     lines = 0
     losses = 0
-    window = pygame.display.get_surface()
-    try:
-        window_width, window_height = window.get_size()
-    except AttributeError:
-        window = pygame.display.set_mode(pygame.display.list_modes()[0])
-        window_width, window_height = window.get_size()
+    window = text.get_screen()
+    window_width, window_height = window.get_size()
     allowed_width = window_width-(left_exclude+right_exclude)*window_width
     allowed_height = window_height-(left_exclude+right_exclude)*window_height
     pygame.mouse.set_visible(False)
@@ -939,12 +927,7 @@ right_exclude must be between 0 and 1."
             # Draw the currently falling piece:
             falling_piece.draw(game_board)
         pygame.display.update()
-        try:
-            c.tick(fps)
-        except AttributeError:
-            # Create the clock:
-            c = pygame.time.Clock()
-            c.tick(fps)
+        c.tick(fps)
     window.fill(background_colour)
     if sound_file:
         pygame.mixer.music.stop()
@@ -6,11 +6,21 @@ issues when attempting to render text, particularly if one is unsure of the
 width and height of a to-be-rendered string in a given font. The functions
 here handle these difficulties.
 
+The display must be set up (with init_display or pygame.display.set_mode)
+before anything is shown. Every function and method in the package that draws
+to the screen, here and in experiment.py and tetromino.py, gets the display
+through get_screen, which raises RuntimeError if there is none, so a slow mode
+change never happens partway through an experiment.
+
 This module includes the following functions (see the docstrings for more
 information):
     tallest_letter: returns the height in pixels of the tallest letter when
 rendered in a given font.
     text_to_sentences: convert a string into a list of sentences.
+    init_display: set the display mode; call once before presenting
+stimuli.
+    get_screen: returns the display surface, raising RuntimeError if no
+display mode has been set.
     screen_dimensions: returns the dimensions of the active display surface.
     longest_string_to_render: return the string in a list that will take up
 the most horizontal space in pixels (this will usually, but not necessarily,
@@ -19,7 +29,13 @@ be the string with the most characters).
 a given font.
     wrap_text: break a string into lines on a screen.
     string_to_screens_and_lines: break a string into screens and lines.
-    render_string: get pygame.Surface and pygame.Rect objects for a string.
+    string_size: get the width and height of a string when rendered in a given
+font (results are cached).
+    line_size: get the recommended line spacing of a font (results are
+cached).
+    render_string: get pygame.Surface and pygame.Rect objects for a string
+(rendered surfaces are cached).
+    clear_render_cache: empty render_string's cache.
     render_lines: return pygame.Surface and pygame.Rect objects for a list of
 strings.
     string_to_surface_and_rect: return pygame.Surface and pygame.Rect objects
@@ -29,15 +45,15 @@ presses a specific key (or any specific key from a list).
     ask_question: display a question to the screen and return the response.
 """
 
-from __future__ import division
-
 import sys
+import os
+from collections import OrderedDict
 
 import pygame
 from pygame.locals import *
 
-import experiment
-import generic
+from . import experiment
+from . import generic
 
 LETTERS = (
     K_a, K_b, K_c, K_d, K_e, K_f, K_g, K_h, K_i, K_j, K_k, K_l, K_m,
@@ -51,13 +67,60 @@ PUNCTUATION = (
     K_PERIOD, K_COMMA, K_QUESTION, K_QUOTE, K_EXCLAIM, K_COLON, K_SEMICOLON
 )
 
+# Rendering text is slow relative to blitting, so rendered surfaces and text
+# sizes are kept in least-recently-used caches of these sizes:
+RENDER_CACHE_SIZE = 256
+SIZE_CACHE_SIZE = 4096
+_render_cache = OrderedDict()
+_size_cache = OrderedDict()
+_line_size_cache = OrderedDict()
+# Whole screens laid out by display_text_until_keypress (e.g., instructions
+# repeated before every block of an experiment):
+SCREEN_CACHE_SIZE = 16
+_screen_cache = OrderedDict()
+# Display-format surfaces released by experiment.InterTrialStimulus objects
+# (see InterTrialStimulus.release), by size, and the number kept for each
+# size:
+SURFACE_POOL = {}
+SURFACE_POOL_SIZE = 4
+# First entry in pygame.display.list_modes(); see screen_dimensions:
+_default_dimensions = None
+
+
+def _cache_lookup(cache, key):
+    """
+    Return the value stored under key in cache (None if there is no such
+    value), marking the entry as the most recently used.
+    """
+    value = cache.pop(key, None)
+    if value is not None:
+        cache[key] = value
+    return value
+
+
+def _cache_store(cache, key, value, max_size):
+    """
+    Store value under key in cache, discarding the least recently used entry
+    if cache grows beyond max_size.
+    """
+    cache[key] = value
+    if len(cache) > max_size:
+        cache.popitem(last = False)
+
+
+def _colour_key(colour):
+    """Return a hashable version of an RGB list/tuple (or None)."""
+    if colour is None:
+        return None
+    return tuple(colour)
+
 
 def tallest_letter(font):
     """
     Get the height, in pixels, of the tallest letter in the alphabet when
     rendered with a given font.
     """
-    return font.size(ALPHABET)[1]
+    return string_size(ALPHABET, font)[1]
 
 
 def text_to_sentences(text, terminators = (".", "?", "!", '."', '?"', '!"'), exclude = ("Mr.", "Ms.", "Mrs.", "Dr.", "e.g.", "i.e.")):
@@ -83,6 +146,10 @@ def text_to_sentences(text, terminators = (".", "?", "!", '."', '?"', '!"'), exc
     Returns:
         sentences: a list of sentences in text.
     """
+    # str.endswith() requires a tuple, and exclusions are checked for every
+    # word that ends with a terminator:
+    terminators = tuple(terminators)
+    exclude = frozenset(exclude)
     sentences = []
     text_as_paragraphs = text.split("\n")
     paragraphs_as_words = []
@@ -109,14 +176,7 @@ def text_to_sentences(text, terminators = (".", "?", "!", '."', '?"', '!"'), exc
             else:
                 sentence = word
             # Check whether word ends with a terminator:
-            try:
-                ends_with_terminator = word.endswith(terminators)
-            except TypeError:
-                # terminators is probably a list rather than a tuple.
-                # str.endswith() requires a tuple.
-                terminators = tuple(terminators)
-                ends_with_terminator = word.endswith(terminators)
-            if ends_with_terminator and word not in exclude:
+            if word.endswith(terminators) and word not in exclude:
                 # This ends the sentence.
                 sentences.append(sentence)
                 sentence = ""
@@ -126,17 +186,76 @@ def text_to_sentences(text, terminators = (".", "?", "!", '."', '?"', '!"'), exc
     return sentences
 
 
+def init_display(size = None, flags = 0):
+    """
+    Set the display mode and return the display surface.
+    
+    This should be called (or pygame.display.set_mode called directly) once,
+    before anything is displayed. Setting a display mode can take tens of
+    milliseconds, so get_screen, which everything in the package that draws
+    to the screen uses, does not do it for you. render_string's cache is
+    cleared, so that text is rendered again in the new display's format.
+    
+    Unless SDL_VIDEO_DOUBLE_BUFFER is already set in the environment, it is
+    set to "1" first, asking SDL to double- rather than triple-buffer the
+    display (calling pygame.display.set_mode directly skips this).
+    
+    Keyword Parameters:
+        size: the width and height of the display, in pixels; defaults to
+            None, in which case the first mode in pygame.display.list_modes()
+            is used.
+        flags: flags passed on to pygame.display.set_mode (e.g., FULLSCREEN);
+            defaults to 0.
+    
+    Returns:
+        screen: the display surface.
+    """
+    if size is None:
+        size = screen_dimensions()
+    # Double- rather than triple-buffering removes up to a frame of latency
+    # between pygame.display.update() and a stimulus appearing. SDL reads the
+    # hint when the display is created, and only some video backends (KMSDRM,
+    # Wayland, and the Raspberry Pi) honour it.
+    os.environ.setdefault("SDL_VIDEO_DOUBLE_BUFFER", "1")
+    screen = pygame.display.set_mode(size, flags)
+    # Cached text and pooled surfaces were converted to the old display's
+    # pixel format, if any.
+    clear_render_cache()
+    return screen
+
+
+def get_screen():
+    """
+    Return the display surface.
+    
+    Raises RuntimeError if no display mode has been set; see init_display.
+    """
+    screen = pygame.display.get_surface()
+    if screen is None:
+        raise RuntimeError(
+            "pygame.display.set_mode (or text.init_display) must be called \
+before presenting stimuli."
+        )
+    return screen
+
+
 def screen_dimensions():
     """
     Get the width and height of the active display surface. If no display
     surface has been set, get the first element in pygame.display.list_modes().
+    
+    The result of pygame.display.list_modes() is cached, as the supported
+    modes do not change while the program runs. The size of the display
+    surface is always read afresh, because pygame.display.set_mode can resize
+    the existing display surface.
     """
+    global _default_dimensions
     screen_surface = pygame.display.get_surface()
-    try:
-        w, h = screen_surface.get_size()
-    except AttributeError:
-        w, h = pygame.display.list_modes()[0]
-    return w, h
+    if screen_surface is not None:
+        return screen_surface.get_size()
+    if _default_dimensions is None:
+        _default_dimensions = tuple(pygame.display.list_modes()[0])
+    return _default_dimensions
 
 
 def longest_string_to_render(strings, f):
@@ -183,7 +302,7 @@ def height_of_strings(strings, f, line_size):
     # Ignore line_size gaps to start:
     for string in strings:
         # Get current height:
-        line_height = f.size(string)[1]
+        line_height = string_size(string, f)[1]
         h = h+line_height
     # Line gaps are added now.
     h = h+line_size*(len(strings)-1)
@@ -516,11 +635,45 @@ allowed_width.".format(widest_word)
     return screens
 
 
+def string_size(s, f):
+    """
+    Get the width and height, in pixels, of a string (s) when rendered with a
+    given font (f).
+    
+    This is the same as f.size(s), but the result is cached, so repeatedly
+    measuring the same string (e.g., rating-scale anchors) is cheap.
+    """
+    key = (f, s)
+    size = _cache_lookup(_size_cache, key)
+    if size is None:
+        size = f.size(s)
+        _cache_store(_size_cache, key, size, SIZE_CACHE_SIZE)
+    return size
+
+
+def line_size(f):
+    """
+    Get the recommended number of pixels between lines of text rendered in a
+    given font (f). This is the same as f.get_linesize(), but cached.
+    """
+    size = _cache_lookup(_line_size_cache, f)
+    if size is None:
+        size = f.get_linesize()
+        _cache_store(_line_size_cache, f, size, SIZE_CACHE_SIZE)
+    return size
+
+
 def render_string(s, f, colour, background, antialiasing = True):
     """
     Create pygame.Surface and pygame.Rect objects for a string, using a
     given font (f) and colour.
     
+    Rendered surfaces are cached, so the returned surface may be shared with
+    other callers; blit from it, but do not draw on it. The returned rect is
+    always a new object and can be moved freely. If the display has been set,
+    surfaces are converted to its pixel format before being cached, so that
+    blitting them to the screen needs no conversion.
+    
     Parameters:
         s: the string to render.
         f: the font in which to render s.
@@ -535,9 +688,37 @@ def render_string(s, f, colour, background, antialiasing = True):
         s: the pygame.Surface object.
         r: the pygame.Rect object.
     """
-    s = f.render(s, antialiasing, colour, background)
-    r = s.get_rect()
-    return s, r
+    key = (
+        f, s, _colour_key(colour), _colour_key(background), antialiasing
+    )
+    surface = _cache_lookup(_render_cache, key)
+    if surface is None:
+        surface = f.render(s, antialiasing, colour, background)
+        if pygame.display.get_surface() is not None:
+            if surface.get_flags() & pygame.SRCALPHA:
+                surface = surface.convert_alpha()
+            else:
+                surface = surface.convert()
+        _cache_store(_render_cache, key, surface, RENDER_CACHE_SIZE)
+    r = surface.get_rect()
+    return surface, r
+
+
+def clear_render_cache():
+    """
+    Empty the cache of surfaces kept by render_string.
+    
+    Cached surfaces are converted to the display's pixel format when
+    rendered (or not converted, if there was no display yet), so the cache
+    should be cleared if the display mode changes; init_display does this.
+    It can also be called between experiments to free the memory held by
+    their text. The screens cached by display_text_until_keypress and the
+    surfaces in SURFACE_POOL, which are in the display's format as well, are
+    emptied too.
+    """
+    _render_cache.clear()
+    _screen_cache.clear()
+    SURFACE_POOL.clear()
 
 
 def render_lines(lines, f, text_colour, background_colour, line_size = None, use_antialiasing = True):
@@ -635,6 +816,69 @@ def string_to_surface_and_rect(s, f, colour, background, max_width, max_height,
     return surfaces, rects
 
 
+def _layout_screens(main_text, main_font, text_colour, background, antialias, pixel_columns, pixel_rows, main_line, break_sentences, sentence_terminators, terminator_exceptions, gap, bottom_message, bottom_font, bottom_line, window_rect):
+    """
+    Lay out the screens shown by display_text_until_keypress (see its
+    docstring for the parameters), returning a list of surfaces and a list of
+    rects centred in window_rect.
+    """
+    # Initialize lists to hold the generated surfaces and rects:
+    surfaces = []
+    rects = []
+    
+    # Get a surface and rect for bottom_message:
+    bottom_lines = string_to_screens_and_lines(
+        bottom_message, pixel_columns, pixel_rows, f = bottom_font,
+        pixels_between_lines = bottom_line
+    )
+    assert len(bottom_lines) == 1, "The bottom_message parameter cannot \
+exceed a single screen."
+    bottom_lines = bottom_lines[0]
+    bottom_surface, bottom_rect = render_lines(
+        bottom_lines, bottom_font, text_colour, background,
+        line_size = bottom_line, use_antialiasing = antialias
+    )
+    
+    # Get the height for main_text:
+    main_height = pixel_rows-bottom_rect.height-gap*main_line
+    if break_sentences:
+        main_lines = string_to_screens_and_lines(
+            main_text, pixel_columns, main_height, main_font,
+            pixels_between_lines = main_line,
+            end_screens_with = sentence_terminators,
+            do_not_include = terminator_exceptions
+        )
+    else:
+        main_lines = string_to_screens_and_lines(
+            main_text, pixel_columns, main_height, main_font,
+            pixels_between_lines = main_line
+        )
+    for screen in main_lines:
+        main_surface, main_rect = render_lines(
+            screen, main_font, text_colour, background, line_size = main_line,
+            use_antialiasing = antialias
+        )
+        bottom_rect_copy = pygame.Rect(bottom_rect)
+        # Create a surface to hold both main_surface and bottom_surface:
+        surfaces_combined = pygame.Surface((pixel_columns, pixel_rows))
+        rects_combined = surfaces_combined.get_rect()
+        surfaces_combined.fill(background)
+        # Centre text with reference to the longer of the main_rect and
+        # bottom_rect:
+        if main_rect.width >= bottom_rect.width:
+            left_coordinate = (pixel_columns-main_rect.width)//2
+        else:
+            left_coordinate = (pixel_columns-bottom_rect.width)//2
+        main_rect.topleft = (left_coordinate, 0)
+        bottom_rect_copy.topleft = (left_coordinate, main_rect.bottom+gap*main_line)
+        surfaces_combined.blit(main_surface, main_rect)
+        surfaces_combined.blit(bottom_surface, bottom_rect_copy)
+        rects_combined.center = window_rect.center
+        surfaces.append(surfaces_combined)
+        rects.append(rects_combined)
+    return surfaces, rects
+
+
 def display_text_until_keypress(main_text, main_font, text_colour, background, antialias = True, proportion_width = 0.95, proportion_height = 0.95, main_line = None, break_sentences = False, sentence_terminators = (".", "!", "?"), terminator_exceptions = (), gap = 1, bottom_message = "Press the space bar to continue.", bottom_font = None, bottom_line = None, advance_keys = (K_SPACE,), reverse_keys = (K_LEFT, K_BACKSPACE,), quit_keys = (K_ESCAPE,), ticker = None, frame_rate = 30, files = ()):
     """
     Display text to the screen and wait for the user to advance. If the text
@@ -683,79 +927,45 @@ def display_text_until_keypress(main_text, main_font, text_colour, background, a
         frame_rate: the maximum frames per second; defaults to 30.
         files: an optional list/tuple of open files to close in case the user
             quits.
+    
+    The laid-out screens are cached (see clear_render_cache), so showing the
+    same text again with the same settings skips wrapping and rendering.
     """
+    if ticker is None:
+        ticker = pygame.time.Clock()
     if not main_line:
         main_line = main_font.get_linesize()
     if not bottom_font:
         bottom_font = main_font
     if not bottom_line:
         bottom_line = bottom_font.get_linesize()
-    window_surface = pygame.display.get_surface()
-    try:
-        window_rect = window_surface.get_rect()
-    except AttributeError:
-        window_surface = pygame.display.set_mode(pygame.display.list_modes()[0])
-        window_rect = window_surface.get_rect()
+    window_surface = get_screen()
+    window_rect = window_surface.get_rect()
     window_surface.fill(background)
     window_width, window_height = window_surface.get_size()
     pixel_columns = int(proportion_width*window_width)
     pixel_rows = int(proportion_height*window_height)
     
-    # Initialize lists to hold the generated surfaces and rects:
-    surfaces = []
-    rects = []
-    
-    # Get a surface and rect for bottom_message:
-    bottom_lines = string_to_screens_and_lines(
-        bottom_message, pixel_columns, pixel_rows, f = bottom_font,
-        pixels_between_lines = bottom_line
-    )
-    assert len(bottom_lines) == 1, "The bottom_message parameter cannot \
-exceed a single screen."
-    bottom_lines = bottom_lines[0]
-    bottom_surface, bottom_rect = render_lines(
-        bottom_lines, bottom_font, text_colour, background,
-        line_size = bottom_line, use_antialiasing = antialias
+    # Laying out text is slow, and the same instructions are often shown
+    # repeatedly (e.g., before each block), so screens are cached:
+    key = (
+        main_text, main_font, _colour_key(text_colour),
+        _colour_key(background), antialias, pixel_columns, pixel_rows,
+        main_line, break_sentences, tuple(sentence_terminators),
+        tuple(terminator_exceptions), gap, bottom_message, bottom_font,
+        bottom_line, window_rect.center
     )
-    
-    # Get the height for main_text:
-    main_height = pixel_rows-bottom_rect.height-gap*main_line
-    if break_sentences:
-        main_lines = string_to_screens_and_lines(
-            main_text, pixel_columns, main_height, main_font,
-            pixels_between_lines = main_line,
-            end_screens_with = sentence_terminators,
-            do_not_include = terminator_exceptions
+    screens = _cache_lookup(_screen_cache, key)
+    if screens is None:
+        screens = _layout_screens(
+            main_text, main_font, text_colour, background, antialias,
+            pixel_columns, pixel_rows, main_line, break_sentences,
+            sentence_terminators, terminator_exceptions, gap, bottom_message,
+            bottom_font, bottom_line, window_rect
         )
-    else:
-        main_lines = string_to_screens_and_lines(
-            main_text, pixel_columns, main_height, main_font,
-            pixels_between_lines = main_line
-        )
-    for screen in main_lines:
-        main_surface, main_rect = render_lines(
-            screen, main_font, text_colour, background, line_size = main_line,
-            use_antialiasing = antialias
-        )
-        bottom_rect_copy = pygame.Rect(bottom_rect)
-        # Create a surface to hold both main_surface and bottom_surface:
-        surfaces_combined = pygame.Surface((pixel_columns, pixel_rows))
-        rects_combined = surfaces_combined.get_rect()
-        surfaces_combined.fill(background)
-        # Centre text with reference to the longer of the main_rect and
-        # bottom_rect:
-        if main_rect.width >= bottom_rect.width:
-            left_coordinate = (pixel_columns-main_rect.width)//2
-        else:
-            left_coordinate = (pixel_columns-bottom_rect.width)//2
-        main_rect.topleft = (left_coordinate, 0)
-        bottom_rect_copy.topleft = (left_coordinate, main_rect.bottom+gap*main_line)
-        surfaces_combined.blit(main_surface, main_rect)
-        surfaces_combined.blit(bottom_surface, bottom_rect_copy)
-        rects_combined.center = window_rect.center
-        surfaces.append(surfaces_combined)
-        rects.append(rects_combined)
-        
+        _cache_store(_screen_cache, key, screens, SCREEN_CACHE_SIZE)
+    surfaces, rects = screens
+    
     i = 0
     surface_i = surfaces[i]
     rect_i = rects[i]
@@ -784,11 +994,7 @@ exceed a single screen."
                 keep_looping= False
             else:
                 pass
-        try:
-            ticker.tick(frame_rate)
-        except AttributeError:
-            ticker = pygame.time.Clock()
-            ticker.tick(frame_rate)
+        ticker.tick(frame_rate)
 
 
 def ask_question(question, f, text_colour, background, antialiasing = True, w = 0.95, h = 0.95, line_size = None, gap = 1, continue_message = "Press the down arrow key to advance.", continue_font = None, continue_line_size = None, min_response = 1, max_response = None, allowed_keys = LETTERS+NUMBERS+PUNCTUATION+(K_SPACE,), move_ahead = (K_DOWN,), move_back = (K_UP,), finished = (K_RETURN,), quit_keys = (K_ESCAPE,), allow_changes = True, ticker = None, frame_rate = 30, files = ()):
@@ -838,14 +1044,13 @@ def ask_question(question, f, text_colour, background, antialiasing = True, w =
     Returns:
         r: the user's response.
     """
+    if ticker is None:
+        ticker = pygame.time.Clock()
     if not line_size:
         line_size = f.get_linesize()
     r = ""
-    window_surface = pygame.display.get_surface()
-    try:
-        window_rect = window_surface.get_rect()
-    except AttributeError:
-        window_surface = pygame.display.set_mode(pygame.display.list_modes()[0])
+    window_surface = get_screen()
+    window_rect = window_surface.get_rect()
     window_surface.fill(background)
     window_width, window_height = window_rect.size
     # Set pixel columns and rows allowed:
@@ -971,6 +1176,8 @@ takes up multiple screens."
     window_surface.blit(surface_i, rect_i)
     answer_obtained = False
     pygame.display.update()
+    # Key names are looked up once rather than on every keypress:
+    key_names = {key: pygame.key.name(key) for key in allowed_keys}
     while not answer_obtained:
         for event in pygame.event.get():
             if event.type == QUIT or (event.type == KEYUP and event.key in quit_keys):
@@ -991,10 +1198,9 @@ takes up multiple screens."
                 rect_i = rects[i]
                 window_surface.blit(surface_i, rect_i)
                 pygame.display.update(rect_i)
-            elif event.type == KEYUP and event.key in allowed_keys and (len(r) < max_response or not max_response):
+            elif event.type == KEYUP and event.key in key_names and (not max_response or len(r) < max_response):
                 # A character has been added to r.
-                character = pygame.key.name(event.key)
-                r = r+character
+                r = r+key_names[event.key]
                 if not finished and len(r) == max_response:
                     answer_obtained = True
                 else:
@@ -1007,7 +1213,7 @@ takes up multiple screens."
                     pygame.display.update(rect_r)
             elif event.type == KEYUP and event.key == K_BACKSPACE and allow_changes and r and i == len(surfaces)-1:
                 # The last character has been deleted.
-                r = r[:len(r)-1]
+                r = r[:-1]
                 update_rect = rect_r
                 surface_r, rect_r = render_string(
                     r, f, text_colour, background, antialiasing
@@ -1021,10 +1227,5 @@ takes up multiple screens."
                 answer_obtained = True
             else:
                 pass
-        try:
-            ticker.tick(frame_rate)
-        except AttributeError:
-            # No clock was passed to the function.
-            ticker = pygame.time.Clock()
-            ticker.tick(frame_rate)
+        ticker.tick(frame_rate)
     return r
@@ -10,7 +10,9 @@ information):
     ready_file_for_writing: given a string, returns a file object ready for
 writing.
     list_or_tuple: write a list or tuple to a file.
+    list_or_tuple_string: get the string list_or_tuple would write.
     write_dict: write a dictionary to a file.
+    dict_string: get the string write_dict would write.
     study_phase: write a study phase to a file.
     paired_study: write a study phase with WordPair objects to a file.
     cued_recall_results: write the results of a cued-recall test to a file.
@@ -18,8 +20,23 @@ writing.
 
 import os
 
-def ready_file_for_writing(f):
-    """Make sure a file is ready for writing. f should be a string or file."""
+def ready_file_for_writing(f, buffering = 65536):
+    """
+    Make sure a file is ready for writing.
+    
+    Parameters:
+        f: a string pointing to an extant or to-be-created file, or a file
+            already open for writing (returned as is).
+    
+    Keyword Parameters:
+        buffering: the buffer size, in bytes, for a file opened by this
+            function; defaults to 65536, so that the many short writes made
+            while recording data reach the disk in a few large chunks.
+    
+    Returns:
+        f: a file open for writing; an extant file is appended to rather than
+            overwritten.
+    """
     try:
         extant = os.path.isfile(f)
     except TypeError:
@@ -27,9 +44,9 @@ def ready_file_for_writing(f):
         return f
     if extant:
         # Don't overwrite the extant file.
-        f = open(f, "a")
+        f = open(f, "a", buffering)
     else:
-        f = open(f, "w")
+        f = open(f, "w", buffering)
     return f
 
 
@@ -50,20 +67,40 @@ def list_or_tuple(f, w, sep = "\n", c = True, end_string = "\n"):
         end_string: a string to write at the end; defaults to "\n".
     """
     f = ready_file_for_writing(f)
-    for i in xrange(len(w)):
-        e = w[i]
+    f.write(list_or_tuple_string(w, sep, end_string))
+    if c:
+        f.close()
+
+
+def list_or_tuple_string(w, sep = "\n", end_string = "\n"):
+    """
+    Get the string that list_or_tuple would write for a list or tuple.
+    
+    Nested lists and tuples are joined with "\n", and nested dicts are
+    formatted as by dict_string. Nothing, not even end_string, is returned
+    for an empty w.
+    
+    Parameters:
+        w: the list or tuple.
+    
+    Keyword Parameters:
+        sep: the string separating each list element; defaults to "\n".
+        end_string: a string to add at the end; defaults to "\n".
+    
+    Returns:
+        the formatted string.
+    """
+    if not w:
+        return ""
+    parts = []
+    for e in w:
         if isinstance(e, (list, tuple)):
-            list_or_tuple(f, e, c = False, end_string = "")
+            parts.append(list_or_tuple_string(e, end_string = ""))
         elif isinstance(e, dict):
-            write_dict(e, f, False, end_string = "")
+            parts.append(dict_string(e, end_string = ""))
         else:
-            f.write(str(e))
-        if i < len(w)-1:
-            f.write(sep)
-        elif end_string:
-            f.write(end_string)
-    if c:
-        f.close()
+            parts.append(str(e))
+    return sep.join(parts)+end_string
 
 
 def write_dict(d, f, c = True, end_string = "\n"):
@@ -77,25 +114,33 @@ def write_dict(d, f, c = True, end_string = "\n"):
     types are converted to strings and written on the same line as the key.
     If c is True, f is closed before the function ends. The end_string
     parameter defaults to "\n". It is written after d is written.
+    
+    The whole of d is formatted by dict_string first and written in one call.
     """
     f = ready_file_for_writing(f)
+    f.write(dict_string(d, end_string))
+    if c:
+        f.close()
+
+
+def dict_string(d, end_string = "\n"):
+    """
+    Get the string that write_dict would write for a dictionary (d), followed
+    by end_string (which defaults to "\n").
+    """
+    parts = []
     for k in d:
-        f.write(str(k)+": ")
         w = d[k]
         if isinstance(w, (list, tuple)):
-            f.write("[\n")
-            list_or_tuple(f, w, c = False)
-            f.write("]\n")
+            parts.append(
+                "{:s}: [\n{:s}]\n".format(str(k), list_or_tuple_string(w))
+            )
         elif isinstance(w, dict):
-            f.write("{\n")
-            write_dict(w, f, False)
-            f.write("}\n")
+            parts.append("{:s}: {{\n{:s}}}\n".format(str(k), dict_string(w)))
         else:
-            f.write(str(w)+"\n")
-    if end_string:
-        f.write(end_string)
-    if c:
-        f.close()
+            parts.append("{:s}: {:s}\n".format(str(k), str(w)))
+    parts.append(end_string)
+    return "".join(parts)
 
 
 def study_phase(stimuli, f, sep = ",", close_when_finished = True):
@@ -123,19 +168,20 @@ def study_phase(stimuli, f, sep = ",", close_when_finished = True):
             before ending the function; defaults to True.
     """
     f = ready_file_for_writing(f)
-    f.write("serial_position{:s}word".format(sep))
+    # The table is built as a list of lines and written in one call.
     if stimuli[0].condition:
-        write_condition = True
-        f.write("{:s}condition\n".format(sep))
+        lines = ["serial_position{0:s}word{0:s}condition".format(sep)]
+        for i, stimulus in enumerate(stimuli):
+            lines.append(
+                "{:d}{:s}{:s}{:s}{:s}".format(
+                    i+1, sep, stimulus.word, sep, str(stimulus.condition)
+                )
+            )
     else:
-        write_condition = False
-        f.write("\n")
-    for i in xrange(len(stimuli)):
-        f.write("{:d}{:s}{:s}".format(i+1, sep, stimuli[i].word))
-        if write_condition:
-            f.write("{:s}{:s}\n".format(sep, str(stimuli[i].condition)))
-        else:
-            f.write("\n")
+        lines = ["serial_position{:s}word".format(sep)]
+        for i, stimulus in enumerate(stimuli):
+            lines.append("{:d}{:s}{:s}".format(i+1, sep, stimulus.word))
+    f.write("\n".join(lines)+"\n")
     if close_when_finished:
         f.close()
 
@@ -172,7 +218,7 @@ def paired_study(stimuli, f, sep = ",", close_when_finished = True):
     else:
         write_condition = False
         f.write("\n")
-    for i in xrange(len(stimuli)):
+    for i in range(len(stimuli)):
         pair = stimuli[i]
         f.write(str(i+1)+sep+pair.cue+sep+pair.target)
         if write_condition:
@@ -215,7 +261,7 @@ def cued_recall_results(word_pairs, f, sep = ",", close_when_finished = True):
     else:
         write_condition = False
         f.write("\n")
-    for i in xrange(len(word_pairs)):
+    for i in range(len(word_pairs)):
         pair = word_pairs[i]
         f.write(str(i+1)+sep+pair.cue+sep+pair.target+sep+pair.response)
         if write_condition:
@@ -15,8 +15,6 @@ within subjects. Tetromino is interpolated between study and test. At
 study, likeability judgments are collected for word pairs.
 """
 
-from __future__ import division
-
 import numpy as np
 
 import cogandmem
@@ -210,7 +208,7 @@ experimental_pairs = cogandmem.generic.convert_to_list(experimental_pairs)
 # cogandmem.experiment has a class called WordPair. The pairs in
 # experimental_pairs are made into WordPair objects next. A future version of
 # cogandmem should probably include a function to do this automatically.
-for i in xrange(len(experimental_pairs)):
+for i in range(len(experimental_pairs)):
     word1, word2 = experimental_pairs[i]
     # Overwrite the list of strings with a WordPair object:
     experimental_pairs[i] = cogandmem.experiment.WordPair(word1, word2, font)
@@ -265,7 +263,7 @@ for condition in ORDER:
                 bottom_message = CONTINUE_TEXT, advance_keys = ADVANCE_TUPLE,
                 frame_rate = FPS, quit_keys = QUIT_TUPLE
             )
-        for i in xrange(SHORT_LENGTH):
+        for i in range(SHORT_LENGTH):
             pair = short_study[i]
             # Call the study method of WordPair:
             pair.study(
@@ -285,14 +283,8 @@ for condition in ORDER:
             # The present script doesn't actually use the information, but the
             # rating can be saved in the rating attribute of WordPair:
             pair.rating = rating
-            # Check if time needs to be added to the ISI:
-            if time_left:
-                # NB: time_left is 0 if total time elapsed.
-                # time_left is in seconds, but we need ms:
-                time_left = cogandmem.generic.seconds_to_milliseconds(
-                    time_left
-                )
-            # Present the ISI:
+            # Present the ISI, adding any time left on the scale. time_left
+            # is in milliseconds (and is 0 if the total time elapsed):
             isi.present(
                 time_change = time_left, frame_rate = FPS,
                 exit_keys = QUIT_TUPLE
@@ -341,7 +333,7 @@ for condition in ORDER:
                 bottom_message = CONTINUE_TEXT, advance_keys = ADVANCE_TUPLE,
                 frame_rate = FPS, quit_keys = QUIT_TUPLE
             )
-        for i in xrange(LONG_LENGTH):
+        for i in range(LONG_LENGTH):
             pair = long_study[i]
             pair.study(
                 STIM_DURATION, frame_rate = FPS, exit_keys = QUIT_TUPLE
@@ -350,10 +342,6 @@ for condition in ORDER:
                 duration = SCALE_DURATION, return_after_input = True,
                 frame_rate = FPS, exit_keys = QUIT_TUPLE
             )
-            if time_left:
-                time_left = cogandmem.generic.seconds_to_milliseconds(
-                    time_left
-                )
             isi.present(
                 time_change = time_left, frame_rate = FPS,
                 exit_keys = QUIT_TUPLE